@@ -2,6 +2,7 @@ from importlib import resources
 from pathlib import Path
 from typing import Optional
 import json
+import re
 import httpx
 
 import typer
@@ -16,6 +17,8 @@ from knack_sleuth.config import Settings, KNACK_BUILDER_BASE_URL, KNACK_NG_BUILD
 from knack_sleuth.core import (
     load_app_metadata as core_load_metadata,
     find_valid_cache,
+    read_metadata_file,
+    parse_metadata_file,
     fetch_metadata_from_api,
     write_cache,
 )
@@ -23,6 +26,53 @@ from knack_sleuth.core import (
 cli = typer.Typer()
 console = Console()
 
+# Patterns for sanitizing object names into output filenames
+_FILENAME_INVALID_RE = re.compile(r'[^\w\-]')
+_DASH_RUN_RE = re.compile(r'-+')
+
+# Direct-impact sections of the impact-analysis markdown, in output order:
+# (direct_impacts key, heading, item format, placeholder when empty,
+#  defaults for keys an item may lack)
+_DIRECT_IMPACT_SECTIONS = (
+    ("connections", "Connections", "- {description}", "*No connection impacts*", {}),
+    (
+        "views",
+        "Views",
+        "- **{view_name}** (`{view_key}`) - {view_type} in scene {scene_name}",
+        "*No view impacts*",
+        {},
+    ),
+    ("forms", "Forms", "- **{view_name}** (`{view_key}`)", "*No form impacts*", {}),
+    (
+        "formulas",
+        "Formulas",
+        "- **{field_name}** (`{field_key}`): `{equation}`",
+        "*No formula impacts*",
+        {"equation": "N/A"},
+    ),
+)
+
+
+def _markdown_list_section(
+    heading: str,
+    items: list[dict],
+    item_format: str,
+    empty_text: str,
+    defaults: Optional[dict] = None,
+) -> list[str]:
+    """Render a '### Heading (count)' markdown section with one bullet per item.
+
+    ``defaults`` fills in placeholders for keys an item does not have.
+    """
+    lines = [f"### {heading} ({len(items)})"]
+    if defaults:
+        lines += [item_format.format_map({**defaults, **item}) for item in items]
+    else:
+        lines += [item_format.format_map(item) for item in items]
+    if not items:
+        lines.append(empty_text)
+    return lines
+
 
 def version_callback(value: bool):
     """Display version and exit."""
@@ -63,13 +113,12 @@ def load_app_metadata(
             if cached:
                 cache_path, cache_age_hours = cached
                 try:
-                    with cache_path.open() as f:
-                        data = json.load(f)
+                    app_export = parse_metadata_file(cache_path)
                     console.print(
                         f"[dim]Using cached data from {cache_path.name} "
                         f"(age: {cache_age_hours:.1f}h)[/dim]"
                     )
-                    return KnackAppMetadata(**data)
+                    return app_export
                 except Exception:
                     # Corrupt/unreadable cache: fall through to a fresh API fetch.
                     console.print(
@@ -557,8 +606,7 @@ def download_metadata(
         if cached:
             cache_path, cache_age_hours = cached
             try:
-                with cache_path.open() as f:
-                    data = json.load(f)
+                data = read_metadata_file(cache_path)
                 console.print(
                     f"[dim]Using cached data from {cache_path.name} "
                     f"(age: {cache_age_hours:.1f}h)[/dim]"
@@ -768,7 +816,7 @@ def export_db_schema(
         # Load from Knack API and export (no API key needed for public metadata)
         knack-sleuth export-db-schema --app-id YOUR_APP_ID -f dbml
     """
-    from knack_sleuth.db_schema import export_database_schema
+    from knack_sleuth.db_schema import write_database_schema
 
     # Validate format
     valid_formats = ["json", "dbml", "yaml", "mermaid"]
@@ -805,16 +853,9 @@ def export_db_schema(
     console.print()
 
     try:
-        # Generate schema
+        # Generate schema and save to file
         console.print(f"[dim]Generating {format.upper()} schema ({detail} detail)...[/dim]")
-        schema = export_database_schema(app, format=format, detail=detail)
-
-        # Save to file
-        with output_file.open("w") as f:
-            if format == "json":
-                json.dump(schema, f, indent=2)
-            else:
-                f.write(schema)
+        write_database_schema(app, output_file, format=format, detail=detail)
 
         file_size = output_file.stat().st_size
         file_size_kb = file_size / 1024
@@ -939,7 +980,7 @@ def export_schema_subgraph(
         knack-sleuth export-schema-subgraph app.json --object Events --detail minimal -f yaml
     """
     from knack_sleuth.db_schema import (
-        export_database_schema,
+        write_database_schema,
         find_object_by_identifier,
         build_subgraph,
         filter_app_to_subgraph,
@@ -983,10 +1024,9 @@ def export_schema_subgraph(
         # Sanitize object name for filename: replace spaces and special chars with dashes
         sanitized_name = object.lower().replace(" ", "-").replace("_", "-")
         # Remove any other problematic characters
-        import re
-        sanitized_name = re.sub(r'[^\w\-]', '', sanitized_name)
+        sanitized_name = _FILENAME_INVALID_RE.sub('', sanitized_name)
         # Remove consecutive dashes
-        sanitized_name = re.sub(r'-+', '-', sanitized_name).strip('-')
+        sanitized_name = _DASH_RUN_RE.sub('-', sanitized_name).strip('-')
         output_file = Path(f"knack_subgraph_{sanitized_name}.{extension_map[format]}")
 
     # Load app metadata (the CLI wrapper handles cache messaging + error reporting)
@@ -1033,16 +1073,9 @@ def export_schema_subgraph(
         # Filter application to subgraph
         filtered_app = filter_app_to_subgraph(app, subgraph_keys)
 
-        # Generate schema
+        # Generate schema and save to file
         console.print(f"[dim]Generating {format.upper()} schema ({detail} detail)...[/dim]")
-        schema = export_database_schema(filtered_app, format=format, detail=detail)
-
-        # Save to file
-        with output_file.open("w") as f:
-            if format == "json":
-                json.dump(schema, f, indent=2)
-            else:
-                f.write(schema)
+        write_database_schema(filtered_app, output_file, format=format, detail=detail)
 
         file_size = output_file.stat().st_size
         file_size_kb = file_size / 1024
@@ -1226,80 +1259,55 @@ def impact_analysis(
         settings = Settings()
         account_slug = app_export.application.account.get('slug', app_export.application.slug)
         scenes_to_review = set(analysis['cascade_impacts']['affected_scenes'])
-        
+
+        # Bind the analysis sections once instead of re-indexing per line
+        target = analysis['target']
+        risk = analysis['risk_assessment']
+        direct = analysis['direct_impacts']
+        cascade = analysis['cascade_impacts']
+        affected_fields = cascade['affected_fields']
+        affected_scenes = cascade['affected_scenes']
+        # Index scene info by key once instead of scanning per affected scene
+        scenes_by_key = {s['scene_key']: s for s in direct['scenes']}
+
         # Generate markdown summary
         md_lines = [
-            f"# Impact Analysis: {analysis['target']['name']}",
+            f"# Impact Analysis: {target['name']}",
             "",
-            f"**Type:** {analysis['target']['type']}  ",
-            f"**Key:** `{analysis['target']['key']}`  ",
-            f"**Description:** {analysis['target']['description']}  ",
+            f"**Type:** {target['type']}  ",
+            f"**Key:** `{target['key']}`  ",
+            f"**Description:** {target['description']}  ",
             "",
             "## Risk Assessment",
             "",
-            f"- **Breaking Change Likelihood:** {analysis['risk_assessment']['breaking_change_likelihood']}",
-            f"- **Impact Score:** {analysis['risk_assessment']['impact_score']}",
-            f"- **Affected Workflows:** {', '.join(analysis['risk_assessment']['affected_user_workflows']) or 'None'}",
+            f"- **Breaking Change Likelihood:** {risk['breaking_change_likelihood']}",
+            f"- **Impact Score:** {risk['impact_score']}",
+            f"- **Affected Workflows:** {', '.join(risk['affected_user_workflows']) or 'None'}",
             "",
             "## Direct Impacts",
             "",
-            f"### Connections ({len(analysis['direct_impacts']['connections'])})",
         ]
 
-        for conn in analysis['direct_impacts']['connections']:
-            md_lines.append(f"- {conn['description']}")
-        if not analysis['direct_impacts']['connections']:
-            md_lines.append("*No connection impacts*")
-
-        md_lines.append("")
-        md_lines.append(f"### Views ({len(analysis['direct_impacts']['views'])})")
-        for view in analysis['direct_impacts']['views']:
-            md_lines.append(
-                f"- **{view['view_name']}** (`{view['view_key']}`) - {view['view_type']} in scene {view['scene_name']}"
-            )
-        if not analysis['direct_impacts']['views']:
-            md_lines.append("*No view impacts*")
-
-        md_lines.append("")
-        md_lines.append(f"### Forms ({len(analysis['direct_impacts']['forms'])})")
-        for form in analysis['direct_impacts']['forms']:
-            md_lines.append(f"- **{form['view_name']}** (`{form['view_key']}`)")
-        if not analysis['direct_impacts']['forms']:
-            md_lines.append("*No form impacts*")
-
-        md_lines.append("")
-        md_lines.append(f"### Formulas ({len(analysis['direct_impacts']['formulas'])})")
-        for formula in analysis['direct_impacts']['formulas']:
-            md_lines.append(f"- **{formula['field_name']}** (`{formula['field_key']}`): `{formula.get('equation', 'N/A')}`")
-        if not analysis['direct_impacts']['formulas']:
-            md_lines.append("*No formula impacts*")
-
-        md_lines.extend([
-            "",
-            "## Cascade Impacts",
-            "",
-            f"### Affected Fields ({len(analysis['cascade_impacts']['affected_fields'])})",
-        ])
-
-        for field in analysis['cascade_impacts']['affected_fields']:
-            md_lines.append(
-                f"- **{field['field_name']}** (`{field['field_key']}`) - {field['field_type']} - {field['usage_count']} usages"
+        for key, heading, item_format, empty_text, defaults in _DIRECT_IMPACT_SECTIONS:
+            md_lines += _markdown_list_section(
+                heading, direct[key], item_format, empty_text, defaults
             )
-        if not analysis['cascade_impacts']['affected_fields']:
-            md_lines.append("*No field cascade impacts*")
+            md_lines.append("")
+
+        md_lines += ["## Cascade Impacts", ""]
+        md_lines += _markdown_list_section(
+            "Affected Fields",
+            affected_fields,
+            "- **{field_name}** (`{field_key}`) - {field_type} - {usage_count} usages",
+            "*No field cascade impacts*",
+        )
 
-        md_lines.extend([
-            "",
-            f"### Affected Scenes ({len(analysis['cascade_impacts']['affected_scenes'])})",
-        ])
-        for scene_key in analysis['cascade_impacts']['affected_scenes']:
-            scene_info = next(
-                (s for s in analysis['direct_impacts']['scenes'] if s['scene_key'] == scene_key),
-                None
-            )
+        md_lines += ["", f"### Affected Scenes ({len(affected_scenes)})"]
+        for scene_key in affected_scenes:
+            scene_info = scenes_by_key.get(scene_key)
             if scene_info:
                 md_lines.append(f"- **{scene_info['scene_name']}** (`{scene_key}`) - /{scene_info['scene_slug']}")
-        if not analysis['cascade_impacts']['affected_scenes']:
+        if not affected_scenes:
             md_lines.append("*No scene cascade impacts*")
 
         md_lines.extend([
@@ -1325,19 +1333,15 @@ def impact_analysis(
                 # Next-Gen builder
                 for scene_key in sorted(scenes_to_review):
                     url = f"{KNACK_NG_BUILDER_BASE_URL}/{account_slug}/portal/pages/{scene_key}"
-                    scene_name = next(
-                        (s['scene_name'] for s in analysis['direct_impacts']['scenes'] if s['scene_key'] == scene_key),
-                        scene_key
-                    )
+                    scene_info = scenes_by_key.get(scene_key)
+                    scene_name = scene_info['scene_name'] if scene_info else scene_key
                     md_lines.append(f"- [{scene_name}]({url})")
             else:
                 # Classic builder
                 for scene_key in sorted(scenes_to_review):
                     url = f"{KNACK_BUILDER_BASE_URL}/{account_slug}/portal/pages/{scene_key}"
-                    scene_name = next(
-                        (s['scene_name'] for s in analysis['direct_impacts']['scenes'] if s['scene_key'] == scene_key),
-                        scene_key
-                    )
+                    scene_info = scenes_by_key.get(scene_key)
+                    scene_name = scene_info['scene_name'] if scene_info else scene_key
                     md_lines.append(f"- [{scene_name}]({url})")
 
         output_content = "\n".join(md_lines)
@@ -1648,7 +1652,6 @@ def role_access_review(
 
         knack-sleuth role-access-review app.json --summary-only  # Show only top-level pages
     """
-    from pathlib import Path
     import csv
     from knack_sleuth.security import generate_security_report, count_children
     
@@ -1799,7 +1802,6 @@ def role_access_summary(
         knack-sleuth role-access-summary --profile-key "profile_1" --app-id YOUR_APP_ID
         knack-sleuth role-access-summary --role "Admin" app.json -o admin_access.csv
     """
-    from pathlib import Path
     import csv
     from knack_sleuth.security import generate_security_report, get_views_for_profile
 
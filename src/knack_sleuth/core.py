@@ -3,20 +3,34 @@
 This module provides the core metadata loading functionality that can be
 used both by the CLI and as a library by other codebases.
 
-The cache primitives (:func:`find_valid_cache`, :func:`fetch_metadata_from_api`,
-and :func:`write_cache`) are the single source of truth for how metadata is
+The cache primitives (:func:`find_valid_cache`, :func:`read_metadata_file`,
+:func:`parse_metadata_file`, :func:`fetch_metadata_from_api`, and
+:func:`write_cache`) are the single source of truth for how metadata is
 located, fetched, and persisted. Both the library entry point
 (:func:`load_app_metadata`) and the CLI compose these primitives so the caching
 behavior stays consistent across every code path.
 """
 
+import atexit
 import json
+import os
+import tempfile
+from functools import cache
 from pathlib import Path
 from typing import Optional
 from datetime import datetime, timedelta
-import glob
 
 import httpx
+from pydantic import ValidationError
+from pydantic_core import from_json, to_json
+
+try:
+    # HTTP/2 support comes from the httpx[http2] extra
+    import h2  # noqa: F401
+except ImportError:  # pragma: no cover - depends on the installed extras
+    _HTTP2 = False
+else:
+    _HTTP2 = True
 
 from knack_sleuth.models import KnackAppMetadata
 from knack_sleuth.config import Settings, KNACK_API_BASE_URL
@@ -25,38 +39,126 @@ from knack_sleuth.config import Settings, KNACK_API_BASE_URL
 CACHE_MAX_AGE = timedelta(hours=24)
 
 
-def _cache_glob(app_id: str) -> str:
-    """Return the glob pattern used to locate cache files for an app."""
-    return f"{app_id}_app_metadata_*.json"
+@cache
+def _http_client() -> httpx.Client:
+    """Return the process-wide HTTP client, creating it on first use.
+
+    Sharing one client keeps connections alive between requests, so repeated
+    fetches (e.g. several apps in one run) skip the TCP and TLS handshakes.
+    """
+    client = httpx.Client(
+        http2=_HTTP2,
+        timeout=30.0,
+        limits=httpx.Limits(max_keepalive_connections=4),
+    )
+    atexit.register(client.close)
+    return client
+
+
+def _list_cache_files(app_id: str, cache_dir: Optional[Path] = None) -> list[str]:
+    """Return the names of an app's cache files in ``cache_dir``.
+
+    Matches ``{app_id}_app_metadata_*.json`` with a single directory scan and
+    plain prefix/suffix checks rather than a compiled glob pattern. Defaults to
+    the current working directory; a directory that does not exist yet simply
+    holds no cache files.
+    """
+    prefix = f"{app_id}_app_metadata_"
+    try:
+        entries = os.scandir(cache_dir)
+    except FileNotFoundError:
+        return []
+    with entries:
+        return [
+            entry.name
+            for entry in entries
+            if entry.name.startswith(prefix)
+            and entry.name.endswith(".json")
+            and entry.is_file()
+        ]
 
 
 def find_valid_cache(
-    app_id: str, max_age: timedelta = CACHE_MAX_AGE
+    app_id: str,
+    max_age: timedelta = CACHE_MAX_AGE,
+    cache_dir: Optional[Path] = None,
 ) -> Optional[tuple[Path, float]]:
     """Find the most recent non-stale cache file for an application.
 
-    Looks in the current working directory for cache files matching the app's
-    naming pattern and returns the newest one that is younger than ``max_age``.
+    Looks in ``cache_dir`` for cache files matching the app's naming pattern
+    and returns the newest one that is younger than ``max_age``.
 
     Args:
         app_id: Knack application ID.
         max_age: Maximum age before a cache file is considered stale.
+        cache_dir: Directory holding cache files. Defaults to the current
+            working directory.
 
     Returns:
         A ``(path, age_in_hours)`` tuple for the freshest valid cache file, or
         ``None`` if no usable cache file exists.
     """
-    cache_files = sorted(glob.glob(_cache_glob(app_id)), reverse=True)
+    cache_files = sorted(_list_cache_files(app_id, cache_dir), reverse=True)
     if not cache_files:
         return None
 
-    latest = Path(cache_files[0])
+    latest = Path(cache_dir or "") / cache_files[0]
     age = datetime.now() - datetime.fromtimestamp(latest.stat().st_mtime)
     if age < max_age:
         return latest, age.total_seconds() / 3600
     return None
 
 
+def read_metadata_file(path: Path) -> dict:
+    """Read raw metadata JSON from a metadata or cache file.
+
+    Parses with pydantic-core's Rust JSON parser, which is several times faster
+    than the stdlib parser on large exports. Invalid JSON is re-parsed with the
+    stdlib so callers still get a ``json.JSONDecodeError`` with line and column
+    details.
+
+    Args:
+        path: Path to the JSON file.
+
+    Returns:
+        The decoded JSON document.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON.
+    """
+    raw = path.read_bytes()
+    try:
+        return from_json(raw)
+    except ValueError:
+        return json.loads(raw)
+
+
+def parse_metadata_file(path: Path) -> KnackAppMetadata:
+    """Parse and validate a metadata or cache file in one pass.
+
+    Decodes the JSON straight into the models, without building the
+    intermediate dict that :func:`read_metadata_file` returns.
+
+    Args:
+        path: Path to the JSON file.
+
+    Returns:
+        KnackAppMetadata: Parsed Pydantic model of the application metadata.
+
+    Raises:
+        json.JSONDecodeError: If the file is not valid JSON.
+        pydantic.ValidationError: If the JSON is not valid application metadata.
+    """
+    raw = path.read_bytes()
+    try:
+        return KnackAppMetadata.model_validate_json(raw)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            # Re-parse so callers get the stdlib error they expect
+            json.loads(raw)
+        raise
+
+
 def fetch_metadata_from_api(app_id: str) -> dict:
     """Fetch raw application metadata from the public Knack metadata endpoint.
 
@@ -74,21 +176,48 @@ def fetch_metadata_from_api(app_id: str) -> dict:
         httpx.RequestError: If the network request fails.
     """
     api_url = f"{KNACK_API_BASE_URL}/applications/{app_id}"
-    response = httpx.get(
+    response = _http_client().get(
         api_url,
         headers={"X-Knack-Application-Id": app_id},
-        timeout=30.0,
     )
     response.raise_for_status()
     return response.json()
 
 
-def write_cache(app_id: str, data: dict) -> Path:
-    """Write raw metadata to a timestamped cache file and return its path."""
+def write_cache(app_id: str, data: dict, cache_dir: Optional[Path] = None) -> Path:
+    """Write raw metadata to a timestamped cache file and return its path.
+
+    The file is created in ``cache_dir`` (created if missing), or the current
+    working directory when it is omitted.
+
+    The JSON is written to a uniquely named temporary sibling file and then
+    renamed into place, so an interrupted write - or another process caching
+    the same app in the same minute - never leaves a truncated cache file
+    behind. The temporary file is removed if the write fails. The cache gets
+    the usual umask-derived permissions (typically 0644) rather than the
+    owner-only 0600 that temporary files are created with.
+    The file is not fsynced: a cache lost on power failure is simply re-fetched.
+    It is written without indentation, which roughly halves its size on disk;
+    pretty-print it with ``python -m json.tool`` when inspecting it by hand.
+    """
+    if cache_dir is not None:
+        cache_dir.mkdir(parents=True, exist_ok=True)
     timestamp = datetime.now().strftime("%Y%m%d%H%M")
-    cache_path = Path(f"{app_id}_app_metadata_{timestamp}.json")
-    with cache_path.open("w") as f:
-        json.dump(data, f, indent=2)
+    cache_path = Path(cache_dir or "") / f"{app_id}_app_metadata_{timestamp}.json"
+    fd, tmp_name = tempfile.mkstemp(
+        dir=cache_path.parent, prefix=f"{cache_path.name}.", suffix=".tmp"
+    )
+    # os.umask has no read-only form: set it, then immediately restore it
+    umask = os.umask(0)
+    os.umask(umask)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(to_json(data))
+        os.chmod(tmp_name, 0o666 & ~umask)
+        os.replace(tmp_name, cache_path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
     return cache_path
 
 
@@ -97,6 +226,7 @@ def load_app_metadata(
     app_id: Optional[str] = None,
     refresh: bool = False,
     no_cache: bool = False,
+    cache_dir: Optional[Path] = None,
 ) -> KnackAppMetadata:
     """
     Load Knack application metadata from file or API.
@@ -110,6 +240,8 @@ def load_app_metadata(
         refresh: Force refresh from API, ignoring cache (only applies when using API).
         no_cache: Skip cache entirely - don't read from cache and don't write to cache.
                   Useful for library usage where you don't want filesystem side effects.
+        cache_dir: Directory to read and write cache files in. Defaults to the
+                   current working directory.
 
     Returns:
         KnackAppMetadata: Parsed Pydantic model of the application metadata.
@@ -142,9 +274,7 @@ def load_app_metadata(
         if not file_path.exists():
             raise FileNotFoundError(f"File not found: {file_path}")
 
-        with file_path.open() as f:
-            data = json.load(f)
-        return KnackAppMetadata(**data)
+        return parse_metadata_file(file_path)
 
     # Load from API (with optional caching)
     final_app_id = app_id or settings.knack_app_id
@@ -156,13 +286,11 @@ def load_app_metadata(
 
     # Reuse a fresh cache file when allowed.
     if not no_cache and not refresh:
-        cached = find_valid_cache(final_app_id)
+        cached = find_valid_cache(final_app_id, cache_dir=cache_dir)
         if cached:
             cache_path, _ = cached
             try:
-                with cache_path.open() as f:
-                    data = json.load(f)
-                return KnackAppMetadata(**data)
+                return parse_metadata_file(cache_path)
             except Exception:
                 # Corrupt/unreadable cache: fall through to a fresh API fetch.
                 pass
@@ -173,6 +301,6 @@ def load_app_metadata(
 
     # Persist to cache unless caching is disabled.
     if not no_cache:
-        write_cache(final_app_id, data)
+        write_cache(final_app_id, data, cache_dir)
 
     return app_export
@@ -4,123 +4,163 @@ This module provides functions to export the actual database structure described
 a Knack application into various schema formats (JSON Schema, DBML, YAML, Mermaid).
 """
 
-from typing import Any, Optional
+import json
+import os
+import re
+import tempfile
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, Optional, TextIO
 from collections import deque
 
 import yaml
 
-from knack_sleuth.models import Application, KnackField, KnackObject
+try:
+    # libyaml-backed emitter when PyYAML was built with it
+    from yaml import CSafeDumper as _YamlDumper
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeDumper as _YamlDumper
 
+from knack_sleuth.models import (
+    Application,
+    Connection,
+    Connections,
+    KnackField,
+    KnackObject,
+)
 
-def _should_include_field(field: KnackField, obj: KnackObject, detail: str) -> bool:
-    """Determine if a field should be included based on detail level.
+# Patterns used to sanitize names for Mermaid output, compiled once at import.
+_ENTITY_SEP_RE = re.compile(r'[\s_/]+')
+_ENTITY_INVALID_RE = re.compile(r'[^\w\-]')
+_DASH_RUN_RE = re.compile(r'-+')
+_FIELD_SPLIT_RE = re.compile(r'[\s\-/()_]+')
+_NONWORD_RE = re.compile(r'[^\w]')
+_HTML_TAG_RE = re.compile(r'<[^>]+>')
+_WHITESPACE_RE = re.compile(r'\s+')
 
-    Args:
-        field: The field to check
-        obj: The object containing the field
-        detail: Detail level - "structural", "minimal", "compact", or "standard"
+# Field attributes read by the JSON Schema and YAML exporters, each fetched in one C-level call
+_JSON_FIELD_ATTRS = attrgetter(
+    "key", "name", "type", "required", "unique", "relationship", "format"
+)
+_YAML_FIELD_ATTRS = attrgetter(
+    "key", "name", "type", "required", "unique", "user", "conditional", "relationship", "format"
+)
+
+
+def _include_structural(field: KnackField, obj: KnackObject) -> bool:
+    """No fields - only show object/table structure."""
+    return False
 
-    Returns:
-        True if the field should be included
-    """
-    if detail == "structural":
-        # No fields - only show object/table structure
-        return False
 
-    if detail == "standard":
-        return True
+def _include_minimal(field: KnackField, obj: KnackObject) -> bool:
+    """Only connection fields."""
+    return field.type == "connection"
 
-    # Connection fields are always included in minimal and compact levels
-    if field.type == "connection":
-        return True
 
-    if detail == "minimal":
-        # Only connection fields
-        return False
+def _include_compact(field: KnackField, obj: KnackObject) -> bool:
+    """Connection fields, identifier fields, and required fields."""
+    return field.type == "connection" or field.key == obj.identifier or field.required
 
-    if detail == "compact":
-        # Include identifier fields, required fields, and connection fields
-        if field.key == obj.identifier:
-            return True
-        if field.required:
-            return True
-        return False
 
+def _include_standard(field: KnackField, obj: KnackObject) -> bool:
+    """All fields."""
     return True
 
 
+# Field filter per detail level, resolved once per export instead of per field
+_FIELD_FILTERS = {
+    "structural": _include_structural,
+    "minimal": _include_minimal,
+    "compact": _include_compact,
+    "standard": _include_standard,
+}
+
+
+def _get_field_filter(detail: str) -> Callable[[KnackField, KnackObject], bool]:
+    """Return the field filter for a detail level.
+
+    Args:
+        detail: Detail level - "structural", "minimal", "compact", or "standard"
+
+    Returns:
+        A predicate taking ``(field, obj)`` that is True if the field should be included
+    """
+    return _FIELD_FILTERS.get(detail, _include_standard)
+
+
+# Knack field type -> SQL data type
+_SQL_TYPES = {
+    "short_text": "VARCHAR(255)",
+    "paragraph_text": "TEXT",
+    "rich_text": "TEXT",
+    "multiple_choice": "VARCHAR(255)",
+    "number": "DECIMAL",
+    "currency": "DECIMAL(19,4)",
+    "boolean": "BOOLEAN",
+    "date_time": "TIMESTAMP",
+    "date": "DATE",
+    "time": "TIME",
+    "email": "VARCHAR(255)",
+    "phone": "VARCHAR(50)",
+    "address": "TEXT",
+    "link": "VARCHAR(2048)",
+    "image": "VARCHAR(2048)",
+    "file": "VARCHAR(2048)",
+    "signature": "VARCHAR(2048)",
+    "name": "VARCHAR(255)",
+    "auto_increment": "INTEGER",
+    "rating": "INTEGER",
+    "connection": "VARCHAR(50)",  # Foreign key
+    "user_roles": "TEXT",
+    "concatenation": "TEXT",  # Computed field
+    "equation": "TEXT",  # Computed field
+    "count": "INTEGER",  # Computed field
+    "sum": "DECIMAL",  # Computed field
+    "min": "DECIMAL",  # Computed field
+    "max": "DECIMAL",  # Computed field
+    "average": "DECIMAL",  # Computed field
+    "timer": "INTEGER",
+}
+
+
 def _get_field_sql_type(field: KnackField) -> str:
     """Map Knack field types to SQL data types."""
-    type_mapping = {
-        "short_text": "VARCHAR(255)",
-        "paragraph_text": "TEXT",
-        "rich_text": "TEXT",
-        "multiple_choice": "VARCHAR(255)",
-        "number": "DECIMAL",
-        "currency": "DECIMAL(19,4)",
-        "boolean": "BOOLEAN",
-        "date_time": "TIMESTAMP",
-        "date": "DATE",
-        "time": "TIME",
-        "email": "VARCHAR(255)",
-        "phone": "VARCHAR(50)",
-        "address": "TEXT",
-        "link": "VARCHAR(2048)",
-        "image": "VARCHAR(2048)",
-        "file": "VARCHAR(2048)",
-        "signature": "VARCHAR(2048)",
-        "name": "VARCHAR(255)",
-        "auto_increment": "INTEGER",
-        "rating": "INTEGER",
-        "connection": "VARCHAR(50)",  # Foreign key
-        "user_roles": "TEXT",
-        "concatenation": "TEXT",  # Computed field
-        "equation": "TEXT",  # Computed field
-        "count": "INTEGER",  # Computed field
-        "sum": "DECIMAL",  # Computed field
-        "min": "DECIMAL",  # Computed field
-        "max": "DECIMAL",  # Computed field
-        "average": "DECIMAL",  # Computed field
-        "timer": "INTEGER",
-    }
-    return type_mapping.get(field.type, "TEXT")
-
-
-def _get_field_json_type(field: KnackField) -> str:
-    """Map Knack field types to JSON Schema types."""
-    type_mapping = {
-        "short_text": "string",
-        "paragraph_text": "string",
-        "rich_text": "string",
-        "multiple_choice": "string",
-        "number": "number",
-        "currency": "number",
-        "boolean": "boolean",
-        "date_time": "string",
-        "date": "string",
-        "time": "string",
-        "email": "string",
-        "phone": "string",
-        "address": "object",
-        "link": "string",
-        "image": "string",
-        "file": "string",
-        "signature": "string",
-        "name": "string",
-        "auto_increment": "integer",
-        "rating": "integer",
-        "connection": "string",
-        "user_roles": "array",
-        "concatenation": "string",
-        "equation": "string",
-        "count": "integer",
-        "sum": "number",
-        "min": "number",
-        "max": "number",
-        "average": "number",
-        "timer": "integer",
-    }
-    return type_mapping.get(field.type, "string")
+    return _SQL_TYPES.get(field.type, "TEXT")
+
+
+# Knack field type -> JSON Schema type
+_JSON_TYPES = {
+    "short_text": "string",
+    "paragraph_text": "string",
+    "rich_text": "string",
+    "multiple_choice": "string",
+    "number": "number",
+    "currency": "number",
+    "boolean": "boolean",
+    "date_time": "string",
+    "date": "string",
+    "time": "string",
+    "email": "string",
+    "phone": "string",
+    "address": "object",
+    "link": "string",
+    "image": "string",
+    "file": "string",
+    "signature": "string",
+    "name": "string",
+    "auto_increment": "integer",
+    "rating": "integer",
+    "connection": "string",
+    "user_roles": "array",
+    "concatenation": "string",
+    "equation": "string",
+    "count": "integer",
+    "sum": "number",
+    "min": "number",
+    "max": "number",
+    "average": "number",
+    "timer": "integer",
+}
 
 
 def find_object_by_identifier(app: Application, identifier: str) -> Optional[KnackObject]:
@@ -235,43 +275,122 @@ def filter_app_to_subgraph(app: Application, subgraph_keys: set[str]) -> Applica
     return filtered_app
 
 
+def _write_lines(lines: Iterable[str], out: TextIO) -> None:
+    """Write lines to a text stream exactly as ``"\\n".join(lines)`` would render them."""
+    write = out.write
+    lines = iter(lines)
+    for line in lines:
+        write(line)
+        break
+    for line in lines:
+        write("\n")
+        write(line)
+
+
+def _build_connection_dict(
+    conn: Connection, object_label: str, detailed: bool
+) -> dict[str, Any]:
+    """Build the export dict for a single connection.
+
+    Args:
+        conn: The connection to describe
+        object_label: Key for the connected object ("target_object" or "source_object")
+        detailed: Also include the field name and relationship type
+
+    Returns:
+        A dict describing the connection
+    """
+    # Each shape is built as a single literal rather than grown key by key
+    if detailed:
+        return {
+            "key": conn.key,
+            "name": conn.name,
+            object_label: conn.object,
+            "field_name": conn.field.name,
+            "has": conn.has,
+            "belongs_to": conn.belongs_to,
+            "relationship_type": _get_relationship_type(conn.has, conn.belongs_to),
+        }
+    return {
+        "key": conn.key,
+        "name": conn.name,
+        object_label: conn.object,
+        "has": conn.has,
+        "belongs_to": conn.belongs_to,
+    }
+
+
+def _build_connections_info(
+    connections: Connections, detailed: bool = False
+) -> dict[str, Any]:
+    """Build the outbound/inbound connection lists for an object in one pass each.
+
+    Args:
+        connections: The object's connections
+        detailed: Also include the field name and relationship type per connection
+
+    Returns:
+        A dict with "outbound" and/or "inbound" lists, omitting empty directions
+    """
+    connections_info: dict[str, Any] = {}
+
+    if connections.outbound:
+        connections_info["outbound"] = [
+            _build_connection_dict(conn, "target_object", detailed)
+            for conn in connections.outbound
+        ]
+
+    if connections.inbound:
+        connections_info["inbound"] = [
+            _build_connection_dict(conn, "source_object", detailed)
+            for conn in connections.inbound
+        ]
+
+    return connections_info
+
+
+# Knack field type -> JSON Schema "format" keyword
+_JSON_STRING_FORMATS = {
+    "email": "email",
+    "date": "date",
+    "date_time": "date-time",
+    "time": "time",
+    "link": "uri",
+}
+
+
 def _build_field_json_schema(field: KnackField) -> dict[str, Any]:
     """Build JSON Schema definition for a field."""
+    # Read every attribute once; field.type alone drives three lookups below
+    key, name, field_type, required, unique, relationship, fmt = _JSON_FIELD_ATTRS(field)
     schema: dict[str, Any] = {
-        "type": _get_field_json_type(field),
-        "title": field.name,
-        "x-knack-type": field.type,
-        "x-knack-key": field.key,
+        "type": _JSON_TYPES.get(field_type, "string"),
+        "title": name,
+        "x-knack-type": field_type,
+        "x-knack-key": key,
     }
 
-    if field.required:
+    if required:
         schema["x-required"] = True
 
-    if field.unique:
+    if unique:
         schema["x-unique"] = True
 
-    if field.type == "email":
-        schema["format"] = "email"
-    elif field.type == "date":
-        schema["format"] = "date"
-    elif field.type == "date_time":
-        schema["format"] = "date-time"
-    elif field.type == "time":
-        schema["format"] = "time"
-    elif field.type == "link":
-        schema["format"] = "uri"
+    string_format = _JSON_STRING_FORMATS.get(field_type)
+    if string_format:
+        schema["format"] = string_format
 
     # Add relationship information for connection fields
-    if field.relationship:
+    if relationship:
         schema["x-relationship"] = {
-            "has": field.relationship.has,
-            "object": field.relationship.object,
-            "belongs_to": field.relationship.belongs_to,
+            "has": relationship.has,
+            "object": relationship.object,
+            "belongs_to": relationship.belongs_to,
         }
 
     # Add format information if available
-    if field.format:
-        schema["x-format"] = field.format.model_dump(exclude_none=True)
+    if fmt:
+        schema["x-format"] = fmt.model_dump(exclude_none=True)
 
     return schema
 
@@ -286,6 +405,13 @@ def export_to_json_schema(app: Application, detail: str = "standard") -> dict[st
     Returns:
         A JSON Schema document describing the database structure
     """
+    counts = app.counts
+    include_field = _get_field_filter(detail)
+    # Structural exports include no fields, so skip the per-field loop outright
+    skip_fields = include_field is _include_structural
+    # ...and standard exports include every field, so skip the filter call
+    include_all = include_field is _include_standard
+
     schema: dict[str, Any] = {
         "$schema": "http://json-schema.org/draft-07/schema#",
         "title": app.name,
@@ -304,7 +430,7 @@ def export_to_json_schema(app: Application, detail: str = "standard") -> dict[st
             "title": obj.name,
             "x-knack-key": obj.key,
             "properties": {},
-            "x-record-count": app.counts.get(obj.key, 0),
+            "x-record-count": counts.get(obj.key, 0),
         }
 
         if obj.user:
@@ -315,44 +441,21 @@ def export_to_json_schema(app: Application, detail: str = "standard") -> dict[st
 
         # Add fields based on detail level
         required_fields = []
-        for field in obj.fields:
-            if _should_include_field(field, obj, detail):
-                obj_schema["properties"][field.key] = _build_field_json_schema(field)
-                if field.required:
-                    required_fields.append(field.key)
+        if not skip_fields:
+            properties = obj_schema["properties"]
+            for field in obj.fields:
+                if include_all or include_field(field, obj):
+                    field_key = field.key
+                    properties[field_key] = _build_field_json_schema(field)
+                    if field.required:
+                        required_fields.append(field_key)
 
         if required_fields:
             obj_schema["required"] = required_fields
 
         # Add connection information
         if obj.connections:
-            connections_info: dict[str, Any] = {}
-
-            if obj.connections.outbound:
-                connections_info["outbound"] = [
-                    {
-                        "key": conn.key,
-                        "name": conn.name,
-                        "target_object": conn.object,
-                        "has": conn.has,
-                        "belongs_to": conn.belongs_to,
-                    }
-                    for conn in obj.connections.outbound
-                ]
-
-            if obj.connections.inbound:
-                connections_info["inbound"] = [
-                    {
-                        "key": conn.key,
-                        "name": conn.name,
-                        "source_object": conn.object,
-                        "has": conn.has,
-                        "belongs_to": conn.belongs_to,
-                    }
-                    for conn in obj.connections.inbound
-                ]
-
-            obj_schema["x-connections"] = connections_info
+            obj_schema["x-connections"] = _build_connections_info(obj.connections)
 
         schema["definitions"][obj.key] = obj_schema
         schema["properties"][obj.key] = {
@@ -364,72 +467,72 @@ def export_to_json_schema(app: Application, detail: str = "standard") -> dict[st
     return schema
 
 
-def export_to_dbml(app: Application, detail: str = "standard") -> str:
-    """Generate DBML (Database Markup Language) schema.
+# (has, belongs_to) -> DBML Ref operator; anything else is many-to-many
+_DBML_RELATIONSHIPS = {
+    ("many", "one"): ">",
+    ("one", "many"): "<",
+    ("one", "one"): "-",
+}
 
-    DBML is a simple, readable DSL language designed to define database schemas.
-    It can be used with tools like dbdiagram.io to generate ER diagrams.
-
-    Args:
-        app: The Knack application metadata
-        detail: Detail level - "structural", "minimal", "compact", or "standard"
 
-    Returns:
-        A DBML string representing the database structure
-    """
-    # Build object index for looking up identifiers
+def _dbml_lines(app: Application, detail: str) -> Iterator[str]:
+    """Yield the lines of the DBML document for ``export_to_dbml``."""
+    # Object index for looking up identifiers
     objects_by_key = {obj.key: obj for obj in app.objects}
+    counts = app.counts
+    include_field = _get_field_filter(detail)
+    # Structural exports include no fields, so skip the per-field loop outright
+    skip_fields = include_field is _include_structural
 
-    lines = []
-    lines.append(f"// Database schema for: {app.name}")
+    yield f"// Database schema for: {app.name}"
     if app.description:
-        lines.append(f"// Description: {app.description}")
-    lines.append(f"// Knack App ID: {app.id}")
-    lines.append("")
+        yield f"// Description: {app.description}"
+    yield f"// Knack App ID: {app.id}"
+    yield ""
 
     # Project metadata
-    lines.append("Project knack_app {")
-    lines.append('  database_type: "Knack"')
-    lines.append(f'  Note: "{app.name}"')
-    lines.append("}")
-    lines.append("")
+    yield "Project knack_app {"
+    yield '  database_type: "Knack"'
+    yield f'  Note: "{app.name}"'
+    yield "}"
+    yield ""
 
     # Define tables (objects)
+    rel_lines: list[str] = []
     for obj in app.objects:
         # Table name and metadata
         table_name = obj.key
-        lines.append(f"Table {table_name} {{")
-        lines.append(f'  // {obj.name}')
+        yield f"Table {table_name} {{"
+        yield f'  // {obj.name}'
 
-        record_count = app.counts.get(obj.key, 0)
+        record_count = counts.get(obj.key, 0)
         if record_count > 0:
-            lines.append(f"  // Records: {record_count}")
+            yield f"  // Records: {record_count}"
 
         if obj.user:
-            lines.append("  // User Profile Object")
+            yield "  // User Profile Object"
 
-        lines.append("")
+        yield ""
 
         # Add fields based on detail level
-        for field in obj.fields:
-            if _should_include_field(field, obj, detail):
-                field_line = f"  {field.key} {_get_field_sql_type(field)}"
-
-                attributes = []
-                if field.required:
-                    attributes.append("not null")
-                if field.unique:
-                    attributes.append("unique")
-                if field.key == obj.identifier:
-                    attributes.append("pk")
-
-                if attributes:
-                    field_line += f" [{', '.join(attributes)}]"
-
-                field_line += f"  // {field.name} ({field.type})"
-                lines.append(field_line)
-
-        lines.append("")
+        if not skip_fields:
+            for field in obj.fields:
+                if include_field(field, obj):
+                    attributes = []
+                    if field.required:
+                        attributes.append("not null")
+                    if field.unique:
+                        attributes.append("unique")
+                    if field.key == obj.identifier:
+                        attributes.append("pk")
+
+                    attrs_str = f" [{', '.join(attributes)}]" if attributes else ""
+                    yield (
+                        f"  {field.key} {_get_field_sql_type(field)}{attrs_str}"
+                        f"  // {field.name} ({field.type})"
+                    )
+
+        yield ""
 
         # Add note with additional metadata
         notes = []
@@ -439,41 +542,62 @@ def export_to_dbml(app: Application, detail: str = "standard") -> str:
             )
 
         if notes:
-            lines.append(f'  Note: "{"; ".join(notes)}"')
+            yield f'  Note: "{"; ".join(notes)}"'
+
+        yield "}"
+        yield ""
 
-        lines.append("}")
-        lines.append("")
+        # Collect relationships (connections) while the object is at hand;
+        # they are emitted after all tables
+        if obj.connections and obj.connections.outbound:
+            for conn in obj.connections.outbound:
+                # Determine relationship type
+                rel_type = _DBML_RELATIONSHIPS.get((conn.has, conn.belongs_to), "<>")
+
+                # Get target object's identifier field
+                target_obj = objects_by_key.get(conn.object)
+                target_field = target_obj.identifier if target_obj and target_obj.identifier else conn.key
+
+                rel_lines.append(
+                    f"Ref: {obj.key}.{conn.key} {rel_type} {conn.object}.{target_field} "
+                    f'// {conn.name}'
+                )
 
     # Define relationships (connections)
-    lines.append("// Relationships")
-    for obj in app.objects:
-        if not obj.connections or not obj.connections.outbound:
-            continue
+    yield "// Relationships"
+    yield from rel_lines
 
-        for conn in obj.connections.outbound:
-            # Determine relationship type
-            if conn.has == "many" and conn.belongs_to == "one":
-                # Many-to-one
-                rel_type = ">"
-            elif conn.has == "one" and conn.belongs_to == "many":
-                # One-to-many
-                rel_type = "<"
-            elif conn.has == "one" and conn.belongs_to == "one":
-                # One-to-one
-                rel_type = "-"
-            else:  # many-to-many
-                rel_type = "<>"
-
-            # Get target object's identifier field
-            target_obj = objects_by_key.get(conn.object)
-            target_field = target_obj.identifier if target_obj and target_obj.identifier else conn.key
-
-            lines.append(
-                f"Ref: {obj.key}.{conn.key} {rel_type} {conn.object}.{target_field} "
-                f'// {conn.name}'
-            )
 
-    return "\n".join(lines)
+def export_to_dbml(app: Application, detail: str = "standard") -> str:
+    """Generate DBML (Database Markup Language) schema.
+
+    DBML is a simple, readable DSL language designed to define database schemas.
+    It can be used with tools like dbdiagram.io to generate ER diagrams.
+
+    Args:
+        app: The Knack application metadata
+        detail: Detail level - "structural", "minimal", "compact", or "standard"
+
+    Returns:
+        A DBML string representing the database structure
+    """
+    return "\n".join(_dbml_lines(app, detail))
+
+
+def export_to_dbml_stream(
+    app: Application, out: TextIO, detail: str = "standard"
+) -> None:
+    """Write the DBML schema to a text stream line by line.
+
+    Produces the same text as ``export_to_dbml`` without holding the whole
+    document in memory, which matters for very large apps.
+
+    Args:
+        app: The Knack application metadata
+        out: Writable text stream (e.g. an open file)
+        detail: Detail level - "structural", "minimal", "compact", or "standard"
+    """
+    _write_lines(_dbml_lines(app, detail), out)
 
 
 def export_to_yaml(app: Application, detail: str = "standard") -> str:
@@ -486,6 +610,11 @@ def export_to_yaml(app: Application, detail: str = "standard") -> str:
     Returns:
         A YAML string representing the database structure
     """
+    counts = app.counts
+    include_field = _get_field_filter(detail)
+    # Structural exports include no fields, so skip the per-field loop outright
+    skip_fields = include_field is _include_structural
+
     schema: dict[str, Any] = {
         "application": {
             "name": app.name,
@@ -500,7 +629,7 @@ def export_to_yaml(app: Application, detail: str = "standard") -> str:
         obj_data: dict[str, Any] = {
             "key": obj.key,
             "name": obj.name,
-            "record_count": app.counts.get(obj.key, 0),
+            "record_count": counts.get(obj.key, 0),
             "is_user_object": obj.user,
             "identifier_field": obj.identifier,
             "fields": [],
@@ -514,125 +643,117 @@ def export_to_yaml(app: Application, detail: str = "standard") -> str:
             }
 
         # Add fields based on detail level
-        for field in obj.fields:
-            if _should_include_field(field, obj, detail):
-                field_data: dict[str, Any] = {
-                    "key": field.key,
-                    "name": field.name,
-                    "type": field.type,
-                    "sql_type": _get_field_sql_type(field),
-                    "required": field.required,
-                    "unique": field.unique,
-                }
-
-                if field.user:
-                    field_data["is_user_field"] = True
-
-                if field.conditional:
-                    field_data["conditional"] = True
-
-                if field.relationship:
-                    field_data["relationship"] = {
-                        "has": field.relationship.has,
-                        "object": field.relationship.object,
-                        "belongs_to": field.relationship.belongs_to,
+        if not skip_fields:
+            append_field = obj_data["fields"].append
+            for field in obj.fields:
+                if include_field(field, obj):
+                    (
+                        key, name, field_type, required, unique,
+                        user, conditional, relationship, fmt,
+                    ) = _YAML_FIELD_ATTRS(field)
+                    field_data: dict[str, Any] = {
+                        "key": key,
+                        "name": name,
+                        "type": field_type,
+                        "sql_type": _get_field_sql_type(field),
+                        "required": required,
+                        "unique": unique,
                     }
 
-                if field.format:
-                    field_data["format"] = field.format.model_dump(exclude_none=True)
+                    if user:
+                        field_data["is_user_field"] = True
 
-                obj_data["fields"].append(field_data)
+                    if conditional:
+                        field_data["conditional"] = True
 
-        # Add connections
-        if obj.connections:
-            connections: dict[str, Any] = {}
+                    if relationship:
+                        field_data["relationship"] = {
+                            "has": relationship.has,
+                            "object": relationship.object,
+                            "belongs_to": relationship.belongs_to,
+                        }
 
-            if obj.connections.outbound:
-                connections["outbound"] = [
-                    {
-                        "key": conn.key,
-                        "name": conn.name,
-                        "target_object": conn.object,
-                        "field_name": conn.field.name,
-                        "has": conn.has,
-                        "belongs_to": conn.belongs_to,
-                        "relationship_type": _get_relationship_type(
-                            conn.has, conn.belongs_to
-                        ),
-                    }
-                    for conn in obj.connections.outbound
-                ]
+                    if fmt:
+                        field_data["format"] = fmt.model_dump(exclude_none=True)
 
-            if obj.connections.inbound:
-                connections["inbound"] = [
-                    {
-                        "key": conn.key,
-                        "name": conn.name,
-                        "source_object": conn.object,
-                        "field_name": conn.field.name,
-                        "has": conn.has,
-                        "belongs_to": conn.belongs_to,
-                        "relationship_type": _get_relationship_type(
-                            conn.has, conn.belongs_to
-                        ),
-                    }
-                    for conn in obj.connections.inbound
-                ]
+                    append_field(field_data)
 
-            obj_data["connections"] = connections
+        # Add connections
+        if obj.connections:
+            obj_data["connections"] = _build_connections_info(
+                obj.connections, detailed=True
+            )
 
         schema["objects"].append(obj_data)
 
-    return yaml.dump(schema, default_flow_style=False, sort_keys=False, indent=2)
+    return yaml.dump(
+        schema,
+        Dumper=_YamlDumper,
+        default_flow_style=False,
+        sort_keys=False,
+        indent=2,
+    )
+
+
+# (has, belongs_to) -> relationship type; anything else is many-to-many
+_RELATIONSHIP_TYPES = {
+    ("one", "one"): "one-to-one",
+    ("one", "many"): "one-to-many",
+    ("many", "one"): "many-to-one",
+}
 
 
 def _get_relationship_type(has: str, belongs_to: str) -> str:
     """Determine the relationship type from has/belongs_to values."""
-    if has == "one" and belongs_to == "one":
-        return "one-to-one"
-    elif has == "one" and belongs_to == "many":
-        return "one-to-many"
-    elif has == "many" and belongs_to == "one":
-        return "many-to-one"
-    else:  # many-to-many
-        return "many-to-many"
+    return _RELATIONSHIP_TYPES.get((has, belongs_to), "many-to-many")
+
+
+# Knack field type -> Mermaid type name
+_MERMAID_TYPES = {
+    "short_text": "string",
+    "paragraph_text": "text",
+    "rich_text": "text",
+    "multiple_choice": "string",
+    "number": "decimal",
+    "currency": "decimal",
+    "boolean": "boolean",
+    "date_time": "datetime",
+    "date": "date",
+    "time": "time",
+    "email": "string",
+    "phone": "string",
+    "address": "text",
+    "link": "string",
+    "image": "string",
+    "file": "string",
+    "signature": "string",
+    "name": "string",
+    "auto_increment": "int",
+    "rating": "int",
+    "connection": "string",
+    "user_roles": "string",
+    "concatenation": "string",
+    "equation": "string",
+    "count": "int",
+    "sum": "decimal",
+    "min": "decimal",
+    "max": "decimal",
+    "average": "decimal",
+    "timer": "int",
+}
 
 
 def _get_mermaid_type(field: KnackField) -> str:
     """Map Knack field types to Mermaid-friendly type names."""
-    type_mapping = {
-        "short_text": "string",
-        "paragraph_text": "text",
-        "rich_text": "text",
-        "multiple_choice": "string",
-        "number": "decimal",
-        "currency": "decimal",
-        "boolean": "boolean",
-        "date_time": "datetime",
-        "date": "date",
-        "time": "time",
-        "email": "string",
-        "phone": "string",
-        "address": "text",
-        "link": "string",
-        "image": "string",
-        "file": "string",
-        "signature": "string",
-        "name": "string",
-        "auto_increment": "int",
-        "rating": "int",
-        "connection": "string",
-        "user_roles": "string",
-        "concatenation": "string",
-        "equation": "string",
-        "count": "int",
-        "sum": "decimal",
-        "min": "decimal",
-        "max": "decimal",
-        "average": "decimal",
-        "timer": "int",
-    }
-    return type_mapping.get(field.type, "string")
+    return _MERMAID_TYPES.get(field.type, "string")
+
+
+# (has, belongs_to) -> Mermaid notation; anything else is many-to-many
+_MERMAID_RELATIONSHIPS = {
+    ("one", "one"): "||--||",
+    ("one", "many"): "||--o{",
+    ("many", "one"): "}o--||",
+}
 
 
 def _get_mermaid_relationship(has: str, belongs_to: str) -> str:
@@ -644,14 +765,7 @@ def _get_mermaid_relationship(has: str, belongs_to: str) -> str:
     - }o--|| : many-to-one (zero or more to exactly one)
     - }o--o{ : many-to-many (zero or more on both sides)
     """
-    if has == "one" and belongs_to == "one":
-        return "||--||"
-    elif has == "one" and belongs_to == "many":
-        return "||--o{"
-    elif has == "many" and belongs_to == "one":
-        return "}o--||"
-    else:  # many-to-many
-        return "}o--o{"
+    return _MERMAID_RELATIONSHIPS.get((has, belongs_to), "}o--o{")
 
 
 def _sanitize_entity_name(name: str) -> str:
@@ -666,19 +780,17 @@ def _sanitize_entity_name(name: str) -> str:
     Returns:
         A sanitized entity name suitable for Mermaid
     """
-    import re
-
     # Convert to uppercase
     sanitized = name.upper()
 
     # Replace spaces, underscores, and other separators with dashes
-    sanitized = re.sub(r'[\s_/]+', '-', sanitized)
+    sanitized = _ENTITY_SEP_RE.sub('-', sanitized)
 
     # Remove any characters that aren't alphanumeric, dash, or underscore
-    sanitized = re.sub(r'[^\w\-]', '', sanitized)
+    sanitized = _ENTITY_INVALID_RE.sub('', sanitized)
 
     # Replace multiple consecutive dashes with single dash
-    sanitized = re.sub(r'-+', '-', sanitized)
+    sanitized = _DASH_RUN_RE.sub('-', sanitized)
 
     # Remove leading/trailing dashes
     sanitized = sanitized.strip('-')
@@ -706,13 +818,11 @@ def _sanitize_field_name(name: str) -> str:
     Returns:
         A camelCase identifier suitable for Mermaid
     """
-    import re
-
     # Split on spaces, dashes, slashes, parentheses, and underscores
-    words = re.split(r'[\s\-/()_]+', name)
+    words = _FIELD_SPLIT_RE.split(name)
 
     # Filter out empty strings and remove non-alphanumeric characters
-    words = [re.sub(r'[^\w]', '', word) for word in words if word]
+    words = [_NONWORD_RE.sub('', word) for word in words if word]
 
     if not words:
         return "field"
@@ -743,10 +853,8 @@ def _strip_html(text: str) -> str:
     Returns:
         Cleaned text without HTML tags
     """
-    import re
-
     # Remove HTML tags
-    text = re.sub(r'<[^>]+>', '', text)
+    text = _HTML_TAG_RE.sub('', text)
 
     # Decode common HTML entities
     text = text.replace('&nbsp;', ' ')
@@ -757,26 +865,14 @@ def _strip_html(text: str) -> str:
     text = text.replace('&#39;', "'")
 
     # Clean up whitespace
-    text = re.sub(r'\s+', ' ', text)
+    text = _WHITESPACE_RE.sub(' ', text)
     text = text.strip()
 
     return text
 
 
-def export_to_mermaid(app: Application, detail: str = "standard") -> str:
-    """Generate Mermaid ER diagram syntax.
-
-    Mermaid is a JavaScript-based diagramming tool that renders markdown-inspired
-    text definitions to create diagrams. This generates an entity-relationship diagram
-    that can be rendered in GitHub, GitLab, VS Code, and many other tools.
-
-    Args:
-        app: The Knack application metadata
-        detail: Detail level - "structural", "minimal", "compact", or "standard"
-
-    Returns:
-        A Mermaid ER diagram string
-    """
+def _mermaid_lines(app: Application, detail: str) -> Iterator[str]:
+    """Yield the lines of the Mermaid ER diagram for ``export_to_mermaid``."""
     # Build a mapping from object keys to sanitized entity names
     # Handle duplicate names by appending the key
     entity_names: dict[str, str] = {}
@@ -793,85 +889,152 @@ def export_to_mermaid(app: Application, detail: str = "standard") -> str:
             name_counts[sanitized] = 1
             entity_names[obj.key] = sanitized
 
-    lines = []
-    lines.append("erDiagram")
-    lines.append(f"    %% Database schema for: {app.name}")
+    include_field = _get_field_filter(detail)
+    # Structural exports include no fields, so skip the per-field loop outright
+    skip_fields = include_field is _include_structural
+
+    yield "erDiagram"
+    yield f"    %% Database schema for: {app.name}"
     if app.description:
-        lines.append(f"    %% Description: {app.description}")
-    lines.append(f"    %% Knack App ID: {app.id}")
-    lines.append("")
+        yield f"    %% Description: {app.description}"
+    yield f"    %% Knack App ID: {app.id}"
+    yield ""
 
     # First pass: Define all relationships
+    # Bind loop-invariant lookups to locals once, outside the connection loops
     relationships_added = set()
+    add_relationship = relationships_added.add
+    get_notation = _get_mermaid_relationship
+    get_entity_name = entity_names.get
     for obj in app.objects:
         if not obj.connections or not obj.connections.outbound:
             continue
 
+        # Entity name for the source is the same for every outbound connection
+        source_name = entity_names[obj.key]
+
         for conn in obj.connections.outbound:
             # Create a unique key to avoid duplicate relationships
-            rel_key = tuple(sorted([obj.key, conn.object]))
+            rel_key = (
+                (obj.key, conn.object)
+                if obj.key <= conn.object
+                else (conn.object, obj.key)
+            )
             if rel_key in relationships_added:
                 continue
 
-            relationships_added.add(rel_key)
+            add_relationship(rel_key)
 
             # Get the relationship notation
-            rel_notation = _get_mermaid_relationship(conn.has, conn.belongs_to)
+            rel_notation = get_notation(conn.has, conn.belongs_to)
 
-            # Get entity names for source and target
-            source_name = entity_names[obj.key]
-            target_name = entity_names.get(conn.object, conn.object)
+            # Get entity name for the target
+            target_name = get_entity_name(conn.object, conn.object)
 
             # Format: SOURCE_TABLE NOTATION TARGET_TABLE : "relationship_name"
-            lines.append(f'    {source_name} {rel_notation} {target_name} : "{conn.name}"')
+            yield f'    {source_name} {rel_notation} {target_name} : "{conn.name}"'
 
     if relationships_added:
-        lines.append("")
+        yield ""
 
     # Second pass: Define all entities (tables) with their fields
     for obj in app.objects:
         # Start entity definition with readable name and key as comment
         entity_name = entity_names[obj.key]
-        lines.append(f"    {entity_name} {{")
+        yield f"    {entity_name} {{"
 
         # Add fields based on detail level
-        for field in obj.fields:
-            if _should_include_field(field, obj, detail):
-                field_type = _get_mermaid_type(field)
-                field_name = _sanitize_field_name(field.name)
+        if not skip_fields:
+            for field in obj.fields:
+                if include_field(field, obj):
+                    field_type = _get_mermaid_type(field)
+                    field_name = _sanitize_field_name(field.name)
+
+                    # Determine primary constraint (Mermaid supports one key constraint)
+                    # Priority: PK > FK > UK (unique)
+                    constraint = ""
+                    if field.key == obj.identifier:
+                        constraint = " PK"
+                    elif field.type == "connection":
+                        constraint = " FK"
+                    elif field.unique:
+                        constraint = " UK"
+
+                    # Add comment from field description if it exists
+                    comment = ""
+
+                    # Try to get description from field metadata
+                    description = None
+                    if hasattr(field, 'meta') and field.meta:
+                        meta = field.meta if isinstance(field.meta, dict) else field.meta.__dict__
+                        if 'description' in meta and meta['description']:
+                            description = _strip_html(meta['description'])
+
+                    if description:
+                        # Use the field description as comment
+                        escaped_desc = description.replace('"', '\\"')
+                        comment = f' "{escaped_desc}"'
+
+                    # Build the attribute line: type name constraints "comment"
+                    yield f"        {field_type} {field_name}{constraint}{comment}"
+
+        yield "    }"
+        yield ""
+
+
+def export_to_mermaid(app: Application, detail: str = "standard") -> str:
+    """Generate Mermaid ER diagram syntax.
+
+    Mermaid is a JavaScript-based diagramming tool that renders markdown-inspired
+    text definitions to create diagrams. This generates an entity-relationship diagram
+    that can be rendered in GitHub, GitLab, VS Code, and many other tools.
+
+    Args:
+        app: The Knack application metadata
+        detail: Detail level - "structural", "minimal", "compact", or "standard"
+
+    Returns:
+        A Mermaid ER diagram string
+    """
+    return "\n".join(_mermaid_lines(app, detail))
+
 
-                # Determine primary constraint (Mermaid supports one key constraint)
-                # Priority: PK > FK > UK (unique)
-                constraint = ""
-                if field.key == obj.identifier:
-                    constraint = " PK"
-                elif field.type == "connection":
-                    constraint = " FK"
-                elif field.unique:
-                    constraint = " UK"
+def export_to_mermaid_stream(
+    app: Application, out: TextIO, detail: str = "standard"
+) -> None:
+    """Write the Mermaid ER diagram to a text stream line by line.
 
-                # Add comment from field description if it exists
-                comment = ""
+    Produces the same text as ``export_to_mermaid`` without holding the whole
+    diagram in memory, which matters for very large apps.
+
+    Args:
+        app: The Knack application metadata
+        out: Writable text stream (e.g. an open file)
+        detail: Detail level - "structural", "minimal", "compact", or "standard"
+    """
+    _write_lines(_mermaid_lines(app, detail), out)
 
-                # Try to get description from field metadata
-                description = None
-                if hasattr(field, 'meta') and field.meta:
-                    meta = field.meta if isinstance(field.meta, dict) else field.meta.__dict__
-                    if 'description' in meta and meta['description']:
-                        description = _strip_html(meta['description'])
 
-                if description:
-                    # Use the field description as comment
-                    escaped_desc = description.replace('"', '\\"')
-                    comment = f' "{escaped_desc}"'
+# Output format -> exporter
+_EXPORTERS: dict[str, Callable[..., str | dict[str, Any]]] = {
+    "json": export_to_json_schema,
+    "dbml": export_to_dbml,
+    "yaml": export_to_yaml,
+    "mermaid": export_to_mermaid,
+}
 
-                # Build the attribute line: type name constraints "comment"
-                lines.append(f"        {field_type} {field_name}{constraint}{comment}")
 
-        lines.append("    }")
-        lines.append("")
+# Output format -> streaming exporter, for formats rendered line by line
+_STREAM_EXPORTERS: dict[str, Callable[[Application, TextIO, str], None]] = {
+    "dbml": export_to_dbml_stream,
+    "mermaid": export_to_mermaid_stream,
+}
 
-    return "\n".join(lines)
+
+def _check_detail(detail: str) -> None:
+    """Raise ValueError if ``detail`` is not a supported detail level."""
+    if detail not in _FIELD_FILTERS:
+        raise ValueError(f"Unsupported detail level: {detail}. Use 'structural', 'minimal', 'compact', or 'standard'")
 
 
 def export_database_schema(
@@ -894,17 +1057,55 @@ def export_database_schema(
     Raises:
         ValueError: If format or detail is not supported
     """
-    valid_details = ["structural", "minimal", "compact", "standard"]
-    if detail not in valid_details:
-        raise ValueError(f"Unsupported detail level: {detail}. Use 'structural', 'minimal', 'compact', or 'standard'")
+    _check_detail(detail)
 
-    if format == "json":
-        return export_to_json_schema(app, detail=detail)
-    elif format == "dbml":
-        return export_to_dbml(app, detail=detail)
-    elif format == "yaml":
-        return export_to_yaml(app, detail=detail)
-    elif format == "mermaid":
-        return export_to_mermaid(app, detail=detail)
-    else:
+    exporter = _EXPORTERS.get(format)
+    if exporter is None:
         raise ValueError(f"Unsupported format: {format}. Use 'json', 'dbml', 'yaml', or 'mermaid'")
+
+    return exporter(app, detail=detail)
+
+
+def write_database_schema(
+    app: Application, path: Path, format: str = "json", detail: str = "standard"
+) -> None:
+    """Export database schema in the specified format and save it to a file.
+
+    DBML and Mermaid are streamed line by line to a temporary file next to
+    ``path``, which replaces ``path`` only once the export succeeds. JSON and
+    YAML are rendered in full before the file is opened. Either way, a failed
+    export leaves any existing file at ``path`` untouched.
+
+    Args:
+        app: The Knack application metadata
+        path: Output file path
+        format: Output format - "json", "dbml", "yaml", or "mermaid"
+        detail: Detail level - "structural", "minimal", "compact", or "standard"
+
+    Raises:
+        ValueError: If format or detail is not supported
+    """
+    stream_exporter = _STREAM_EXPORTERS.get(format)
+    if stream_exporter is None:
+        schema = export_database_schema(app, format=format, detail=detail)
+        with path.open("w") as f:
+            if format == "json":
+                json.dump(schema, f, indent=2)
+            else:
+                f.write(schema)
+        return
+
+    _check_detail(detail)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".tmp")
+    # os.umask has no read-only form: set it, then immediately restore it
+    umask = os.umask(0)
+    os.umask(umask)
+    try:
+        with os.fdopen(fd, "w") as f:
+            stream_exporter(app, f, detail)
+        # mkstemp creates files as 0600; give the export normal permissions
+        os.chmod(tmp_name, 0o666 & ~umask)
+        os.replace(tmp_name, path)
+    except BaseException:
+        os.unlink(tmp_name)
+        raise
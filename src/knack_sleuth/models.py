@@ -1,3 +1,4 @@
+import sys
 from typing import Any, Literal
 
 from pydantic import BaseModel, field_validator
@@ -43,6 +44,18 @@ class KnackField(BaseModel):
 
     model_config = {"populate_by_name": True, "extra": "allow"}
 
+    @field_validator('type')
+    @classmethod
+    def intern_type(cls, v: str) -> str:
+        """Intern the field type - a few dozen values repeat across every field."""
+        return sys.intern(v)
+
+    @field_validator('key')
+    @classmethod
+    def intern_key(cls, v: str) -> str:
+        """Intern the field key - it is the lookup key for every search index."""
+        return sys.intern(v)
+
 
 # ============================================================================
 # Object Models
@@ -106,6 +119,12 @@ class KnackObject(BaseModel):
 
     model_config = {"extra": "allow"}
 
+    @field_validator('key')
+    @classmethod
+    def intern_key(cls, v: str) -> str:
+        """Intern the object key - it is the lookup key for every search index."""
+        return sys.intern(v)
+
 
 # ============================================================================
 # View Models
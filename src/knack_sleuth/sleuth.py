@@ -1,324 +1,395 @@
 """Core search functionality for finding object and field usages in Knack metadata."""
 
+import re
+import sys
+from collections import Counter, defaultdict
+from itertools import chain
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Iterator
 
-from knack_sleuth.models import KnackAppMetadata, KnackObject
+from knack_sleuth.models import KnackAppMetadata, KnackObject, View
 
+# Brace-delimited references in an equation, e.g. "field_4" in "getNameLast({field_4})"
+_FIELD_REF_RE = re.compile(r"\{([^{}]+)\}")
 
-@dataclass
+
+class _ReadOnlyDict(dict):
+    """A dict that rejects changes once built.
+
+    Still a real dict, so it serializes to JSON and copies/pickles as usual.
+    """
+
+    __slots__ = ()
+
+    def _read_only(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("usage details are read-only; copy with dict() to modify")
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __reduce__(self):
+        return (type(self), (dict(self),))
+
+
+@dataclass(slots=True, frozen=True)
 class Usage:
-    """Represents a usage of an object or field."""
+    """Represents a usage of an object or field.
+
+    Usages are built once when the search indexes are created and shared by
+    every search that returns them, so they are immutable. Each usage gets its
+    own read-only copy of ``details``; copy it with ``dict(usage.details)`` to
+    modify it.
+    """
 
     location_type: str  # "connection", "view_source", "view_column", "field_equation", etc.
     context: str  # Human-readable description of where it's used
     details: dict[str, Any]  # Additional context-specific information
 
+    def __post_init__(self) -> None:
+        if type(self.details) is not _ReadOnlyDict:
+            object.__setattr__(self, "details", _ReadOnlyDict(self.details))
+
 
 class KnackSleuth:
     """Search engine for finding object and field usages in Knack metadata."""
 
+    __slots__ = (
+        "app",
+        "objects_by_key",
+        "field_to_object",
+        "_object_usages",
+        "_field_usages",
+        "_search_object_cache",
+        "_view_counts_by_object",
+        "_all_views",
+        "_objects_with_field_usages",
+    )
+
     def __init__(self, app_export: KnackAppMetadata):
         self.app = app_export.application
         self._build_indexes()
+        # Per-instance (not lru_cache, which would keep the instance alive)
+        self._search_object_cache: dict[str, dict[str, tuple[Usage, ...]]] = {}
 
     def _build_indexes(self) -> None:
-        """Build lookup indexes for faster searching."""
+        """Build lookup indexes for faster searching.
+
+        All indexes are filled in a single pass over the objects and a single
+        pass over the scene views. Usages are built here, once, so searches
+        only look them up.
+        """
         # Object index
-        self.objects_by_key: dict[str, KnackObject] = {
-            obj.key: obj for obj in self.app.objects
-        }
+        self.objects_by_key: dict[str, KnackObject] = {}
 
         # Field index (field_key -> object_key)
         self.field_to_object: dict[str, str] = {}
-        for obj in self.app.objects:
-            for field in obj.fields:
-                self.field_to_object[field.key] = obj.key
 
-    def search_object(self, object_key: str) -> dict[str, list[Usage]]:
-        """
-        Search for all usages of an object and cascade to its fields.
+        # Object usages (object_key -> usages), connections first, then views
+        object_usages: defaultdict[str, list[Usage]] = defaultdict(list)
 
-        Returns a dict with:
-        - "object_usages": list of usages of the object itself
-        - field keys (e.g., "field_116"): list of usages for each field
-        """
-        if object_key not in self.objects_by_key:
-            return {}
+        # Field usages (field_key -> usages), one index per location group
+        connection_field_usages: defaultdict[str, list[Usage]] = defaultdict(list)
+        object_field_usages: defaultdict[str, list[Usage]] = defaultdict(list)
+        view_column_usages: defaultdict[str, list[Usage]] = defaultdict(list)
+        view_field_usages: defaultdict[str, list[Usage]] = defaultdict(list)
+        form_input_usages: defaultdict[str, list[Usage]] = defaultdict(list)
+        # Each equation is parsed once and filed under every key it references
+        equation_usages: defaultdict[str, list[Usage]] = defaultdict(list)
 
-        obj = self.objects_by_key[object_key]
-        results: dict[str, list[Usage]] = {"object_usages": []}
-
-        # Search for object-level usages
-        results["object_usages"] = self._find_object_usages(object_key)
+        # Index keys are interned so lookups by a model's own (interned) object
+        # or field key match on identity instead of comparing characters
+        intern = sys.intern
 
-        # Cascade: search for each field in the object
-        for field in obj.fields:
-            field_usages = self._find_field_usages(field.key)
-            if field_usages:
-                results[field.key] = field_usages
+        # Number of views sourced from each object, for the summary analyses
+        view_counts_by_object: Counter[str] = Counter()
+        # Every view in app order, for flat iteration over views
+        all_views: list[View] = []
 
-        return results
-
-    def search_field(self, field_key: str) -> list[Usage]:
-        """Search for all usages of a specific field."""
-        if field_key not in self.field_to_object:
-            return []
-
-        return self._find_field_usages(field_key)
-
-    def _find_object_usages(self, object_key: str) -> list[Usage]:
-        """Find all places where an object is referenced."""
-        usages: list[Usage] = []
-
-        # 1. Check connections (inbound and outbound)
         for obj in self.app.objects:
-            if obj.connections:
-                # Check outbound connections
-                for conn in obj.connections.outbound:
-                    if conn.object == object_key:
-                        usages.append(
-                            Usage(
-                                location_type="connection_outbound",
-                                context=f"{obj.name} ({obj.key}) connects to this object via {conn.name} ({conn.key})",
-                                details={
-                                    "source_object": obj.key,
-                                    "source_object_name": obj.name,
-                                    "connection_field": conn.key,
-                                    "connection_name": conn.name,
-                                    "relationship": f"{conn.has} to {conn.belongs_to}",
-                                },
-                            )
-                        )
-
-                # Check inbound connections
-                for conn in obj.connections.inbound:
-                    if conn.object == object_key:
-                        usages.append(
-                            Usage(
-                                location_type="connection_inbound",
-                                context=f"This object connects from {obj.name} ({obj.key}) via {conn.name} ({conn.key})",
-                                details={
-                                    "target_object": obj.key,
-                                    "target_object_name": obj.name,
-                                    "connection_field": conn.key,
-                                    "connection_name": conn.name,
-                                    "relationship": f"{conn.has} to {conn.belongs_to}",
-                                },
-                            )
-                        )
+            obj_key = obj.key
+            obj_name = obj.name
+            self.objects_by_key[obj_key] = obj
 
-        # 2. Check view sources
-        for scene in self.app.scenes:
-            for view in scene.views:
-                if view.source and view.source.object == object_key:
-                    usages.append(
+            for field in obj.fields:
+                field_key = field.key
+                self.field_to_object[field_key] = obj_key
+                fmt = field.format
+                if fmt is None:
+                    continue
+                equation = getattr(fmt, "equation", None)
+                if not equation:
+                    continue
+
+                usage = Usage(
+                    location_type="field_equation",
+                    context=f"Referenced in equation for {obj_name}.{field.name} ({field_key})",
+                    details={
+                        "object_key": obj_key,
+                        "object_name": obj_name,
+                        "field_key": field_key,
+                        "field_name": field.name,
+                        "equation": equation,
+                    },
+                )
+                for ref in set(_FIELD_REF_RE.findall(str(equation))):
+                    equation_usages[intern(ref)].append(usage)
+
+            conns = obj.connections
+            if conns is not None:
+                for conn in conns.outbound:
+                    conn_key = conn.key
+                    conn_name = conn.name
+                    object_usages[intern(conn.object)].append(
                         Usage(
-                            location_type="view_source",
-                            context=f"View '{view.name}' ({view.key}) in scene '{scene.name}' ({scene.key}) displays this object",
+                            location_type="connection_outbound",
+                            context=f"{obj_name} ({obj_key}) connects to this object via {conn_name} ({conn_key})",
                             details={
-                                "scene_key": scene.key,
-                                "scene_name": scene.name,
-                                "view_key": view.key,
-                                "view_name": view.name,
-                                "view_type": view.type,
+                                "source_object": obj_key,
+                                "source_object_name": obj_name,
+                                "connection_field": conn_key,
+                                "connection_name": conn_name,
+                                "relationship": f"{conn.has} to {conn.belongs_to}",
                             },
                         )
                     )
-
-                # Check parent_source
-                if (
-                    view.source
-                    and view.source.parent_source
-                    and view.source.parent_source.object == object_key
-                ):
-                    usages.append(
+                    connection_field_usages[intern(conn_key)].append(
                         Usage(
-                            location_type="view_parent_source",
-                            context=f"View '{view.name}' ({view.key}) uses this object as parent source",
+                            location_type="connection_field",
+                            context=f"Connection field in {obj_name} ({obj_key})",
                             details={
-                                "scene_key": scene.key,
-                                "scene_name": scene.name,
-                                "view_key": view.key,
-                                "view_name": view.name,
+                                "object_key": obj_key,
+                                "object_name": obj_name,
+                                "target_object": conn.object,
+                                "connection_name": conn_name,
                             },
                         )
                     )
-
-        return usages
-
-    def _find_field_usages(self, field_key: str) -> list[Usage]:
-        """Find all places where a field is referenced."""
-        usages: list[Usage] = []
-
-        # 1. Check if it's a connection field
-        for obj in self.app.objects:
-            if obj.connections:
-                for conn in obj.connections.outbound:
-                    if conn.key == field_key:
-                        usages.append(
-                            Usage(
-                                location_type="connection_field",
-                                context=f"Connection field in {obj.name} ({obj.key})",
-                                details={
-                                    "object_key": obj.key,
-                                    "object_name": obj.name,
-                                    "target_object": conn.object,
-                                    "connection_name": conn.name,
-                                },
-                            )
+                for conn in conns.inbound:
+                    conn_key = conn.key
+                    conn_name = conn.name
+                    object_usages[intern(conn.object)].append(
+                        Usage(
+                            location_type="connection_inbound",
+                            context=f"This object connects from {obj_name} ({obj_key}) via {conn_name} ({conn_key})",
+                            details={
+                                "target_object": obj_key,
+                                "target_object_name": obj_name,
+                                "connection_field": conn_key,
+                                "connection_name": conn_name,
+                                "relationship": f"{conn.has} to {conn.belongs_to}",
+                            },
                         )
+                    )
 
-        # 2. Check object sort fields
-        for obj in self.app.objects:
-            if obj.sort and obj.sort.field == field_key:
-                usages.append(
+            obj_sort = obj.sort
+            if obj_sort:
+                object_field_usages[intern(obj_sort.field)].append(
                     Usage(
                         location_type="object_sort",
-                        context=f"Used as sort field for {obj.name} ({obj.key})",
+                        context=f"Used as sort field for {obj_name} ({obj_key})",
                         details={
-                            "object_key": obj.key,
-                            "object_name": obj.name,
-                            "sort_order": obj.sort.order,
+                            "object_key": obj_key,
+                            "object_name": obj_name,
+                            "sort_order": obj_sort.order,
                         },
                     )
                 )
-
-            # Check if it's the identifier field
-            if obj.identifier == field_key:
-                usages.append(
+            if obj.identifier:
+                object_field_usages[intern(obj.identifier)].append(
                     Usage(
                         location_type="object_identifier",
-                        context=f"Used as identifier field for {obj.name} ({obj.key})",
+                        context=f"Used as identifier field for {obj_name} ({obj_key})",
                         details={
-                            "object_key": obj.key,
-                            "object_name": obj.name,
+                            "object_key": obj_key,
+                            "object_name": obj_name,
                         },
                     )
                 )
 
-        # 3. Check field equations (field references like {field_123})
-        for obj in self.app.objects:
-            for field in obj.fields:
-                if field.format:
-                    # Access equation from the format dict if it exists
-                    format_dict = (
-                        field.format.model_dump()
-                        if hasattr(field.format, "model_dump")
-                        else {}
+        for scene in self.app.scenes:
+            scene_key = scene.key
+            scene_name = scene.name
+            for view in scene.views:
+                all_views.append(view)
+                view_key = view.key
+                view_name = view.name
+                # Details for every usage that only identifies the view (each
+                # Usage takes its own read-only copy)
+                view_details = {
+                    "scene_key": scene_key,
+                    "scene_name": scene_name,
+                    "view_key": view_key,
+                    "view_name": view_name,
+                }
+
+                source = view.source
+                if source:
+                    view_counts_by_object[source.object] += 1
+                    object_usages[intern(source.object)].append(
+                        Usage(
+                            location_type="view_source",
+                            context=f"View '{view_name}' ({view_key}) in scene '{scene_name}' ({scene_key}) displays this object",
+                            details={
+                                "scene_key": scene_key,
+                                "scene_name": scene_name,
+                                "view_key": view_key,
+                                "view_name": view_name,
+                                "view_type": view.type,
+                            },
+                        )
                     )
-                    equation = format_dict.get("equation")
-                    if equation and f"{{{field_key}}}" in str(equation):
-                        usages.append(
+                    parent_source = source.parent_source
+                    if parent_source:
+                        object_usages[intern(parent_source.object)].append(
+                            Usage(
+                                location_type="view_parent_source",
+                                context=f"View '{view_name}' ({view_key}) uses this object as parent source",
+                                details=view_details,
+                            )
+                        )
+
+                    for sort in source.sort or ():
+                        view_field_usages[intern(sort.field)].append(
                             Usage(
-                                location_type="field_equation",
-                                context=f"Referenced in equation for {obj.name}.{field.name} ({field.key})",
+                                location_type="view_sort",
+                                context=f"Sort field in view '{view_name}' ({view_key})",
                                 details={
-                                    "object_key": obj.key,
-                                    "object_name": obj.name,
-                                    "field_key": field.key,
-                                    "field_name": field.name,
-                                    "equation": equation,
+                                    "scene_key": scene_key,
+                                    "scene_name": scene_name,
+                                    "view_key": view_key,
+                                    "view_name": view_name,
+                                    "sort_order": sort.order,
                                 },
                             )
                         )
+                    if parent_source:
+                        view_field_usages[intern(parent_source.connection)].append(
+                            Usage(
+                                location_type="view_parent_connection",
+                                context=f"Parent connection in view '{view_name}' ({view_key})",
+                                details=view_details,
+                            )
+                        )
+                    if source.connection_key:
+                        view_field_usages[intern(source.connection_key)].append(
+                            Usage(
+                                location_type="view_connection_key",
+                                context=f"Connection key in view '{view_name}' ({view_key})",
+                                details=view_details,
+                            )
+                        )
 
-        # 4. Check view columns
-        for scene in self.app.scenes:
-            for view in scene.views:
                 for col in view.columns:
-                    if col.field and col.field.get("key") == field_key:
-                        usages.append(
+                    col_field = col.field
+                    if col_field and col_field.get("key"):
+                        view_column_usages[intern(col_field["key"])].append(
                             Usage(
                                 location_type="view_column",
-                                context=f"Column in view '{view.name}' ({view.key}) in scene '{scene.name}'",
+                                context=f"Column in view '{view_name}' ({view_key}) in scene '{scene_name}'",
                                 details={
-                                    "scene_key": scene.key,
-                                    "scene_name": scene.name,
-                                    "view_key": view.key,
-                                    "view_name": view.name,
+                                    "scene_key": scene_key,
+                                    "scene_name": scene_name,
+                                    "view_key": view_key,
+                                    "view_name": view_name,
                                     "view_type": view.type,
                                     "column_header": col.header,
                                 },
                             )
                         )
 
-        # 5. Check view source sort fields
-        for scene in self.app.scenes:
-            for view in scene.views:
-                if view.source and view.source.sort:
-                    for sort in view.source.sort:
-                        if sort.field == field_key:
-                            usages.append(
-                                Usage(
-                                    location_type="view_sort",
-                                    context=f"Sort field in view '{view.name}' ({view.key})",
-                                    details={
-                                        "scene_key": scene.key,
-                                        "scene_name": scene.name,
-                                        "view_key": view.key,
-                                        "view_name": view.name,
-                                        "sort_order": sort.order,
-                                    },
-                                )
-                            )
-
-                # Check connection_key in parent_source
-                if (
-                    view.source
-                    and view.source.parent_source
-                    and view.source.parent_source.connection == field_key
-                ):
-                    usages.append(
-                        Usage(
-                            location_type="view_parent_connection",
-                            context=f"Parent connection in view '{view.name}' ({view.key})",
-                            details={
-                                "scene_key": scene.key,
-                                "scene_name": scene.name,
-                                "view_key": view.key,
-                                "view_name": view.name,
-                            },
-                        )
-                    )
-
-                # Check connection_key
-                if view.source and view.source.connection_key == field_key:
-                    usages.append(
-                        Usage(
-                            location_type="view_connection_key",
-                            context=f"Connection key in view '{view.name}' ({view.key})",
-                            details={
-                                "scene_key": scene.key,
-                                "scene_name": scene.name,
-                                "view_key": view.key,
-                                "view_name": view.name,
-                            },
-                        )
-                    )
-
-        # 6. Check form inputs
-        for scene in self.app.scenes:
-            for view in scene.views:
                 for input_field in view.inputs:
-                    if (
-                        isinstance(input_field, dict)
-                        and input_field.get("key") == field_key
+                    if isinstance(input_field, dict) and isinstance(
+                        input_field.get("key"), str
                     ):
-                        usages.append(
+                        form_input_usages[intern(input_field["key"])].append(
                             Usage(
                                 location_type="form_input",
-                                context=f"Input field in form '{view.name}' ({view.key})",
-                                details={
-                                    "scene_key": scene.key,
-                                    "scene_name": scene.name,
-                                    "view_key": view.key,
-                                    "view_name": view.name,
-                                },
+                                context=f"Input field in form '{view_name}' ({view_key})",
+                                details=view_details,
                             )
                         )
 
-        return usages
+        # Freeze into tuples shared by every search. Field usages are merged
+        # across the location groups here, in the same group order a full scan
+        # would report them
+        self._object_usages: dict[str, tuple[Usage, ...]] = {
+            key: tuple(usages) for key, usages in object_usages.items()
+        }
+        field_groups = (
+            connection_field_usages,
+            object_field_usages,
+            equation_usages,
+            view_column_usages,
+            view_field_usages,
+            form_input_usages,
+        )
+        self._field_usages: dict[str, tuple[Usage, ...]] = {
+            key: tuple(chain.from_iterable(group.get(key, ()) for group in field_groups))
+            for key in set().union(*field_groups)
+        }
+        self._view_counts_by_object: Counter[str] = view_counts_by_object
+        self._all_views: tuple[View, ...] = tuple(all_views)
+
+        # Objects with at least one used field - search_object skips the
+        # per-field cascade for every other object
+        field_usages = self._field_usages
+        self._objects_with_field_usages: frozenset[str] = frozenset(
+            obj.key
+            for obj in self.app.objects
+            if any(field.key in field_usages for field in obj.fields)
+        )
+
+    def search_object(self, object_key: str) -> dict[str, list[Usage]]:
+        """
+        Search for all usages of an object and cascade to its fields.
+
+        Returns a dict with:
+        - "object_usages": list of usages of the object itself
+        - field keys (e.g., "field_116"): list of usages for each field
+        """
+        if object_key not in self.objects_by_key:
+            return {}
+
+        cached = self._search_object_cache.get(object_key)
+        if cached is None:
+            obj = self.objects_by_key[object_key]
+            cached = {"object_usages": self._find_object_usages(object_key)}
+
+            # Cascade: search for each field in the object
+            if object_key in self._objects_with_field_usages:
+                find_field_usages = self._field_usages.get
+                for field in obj.fields:
+                    field_usages = find_field_usages(field.key)
+                    if field_usages:
+                        cached[field.key] = field_usages
+
+            self._search_object_cache[object_key] = cached
+
+        # Fresh lists so callers can't modify the cached results
+        return {key: list(usages) for key, usages in cached.items()}
+
+    def search_field(self, field_key: str) -> list[Usage]:
+        """Search for all usages of a specific field."""
+        if field_key not in self.field_to_object:
+            return []
+
+        return list(self._find_field_usages(field_key))
+
+    def iter_object_usages(self, object_key: str) -> Iterator[Usage]:
+        """Yield usages of an object itself (not its fields) in search order."""
+        yield from self._object_usages.get(object_key, ())
+
+    def iter_field_usages(self, field_key: str) -> Iterator[Usage]:
+        """Yield usages of a field in search order, for callers that may stop early."""
+        yield from self._field_usages.get(field_key, ())
+
+    def _find_object_usages(self, object_key: str) -> tuple[Usage, ...]:
+        """Find all places where an object is referenced."""
+        return self._object_usages.get(object_key, ())
+
+    def _find_field_usages(self, field_key: str) -> tuple[Usage, ...]:
+        """Find all places where a field is referenced."""
+        return self._field_usages.get(field_key, ())
 
     def get_object_info(self, object_key: str) -> KnackObject | None:
         """Get the object definition."""
@@ -690,7 +761,7 @@ class KnackSleuth:
     def _analyze_application_metadata(self) -> dict[str, Any]:
         """Extract basic application metadata and complexity metrics."""
         total_fields = sum(len(obj.fields) for obj in self.app.objects)
-        total_views = sum(len(scene.views) for scene in self.app.scenes)
+        total_views = len(self._all_views)
         total_records = self.app.counts.get("total_entries", 0)
 
         # Calculate connection density
@@ -775,13 +846,9 @@ class KnackSleuth:
         connection_score = connection_count / max_connections if max_connections > 0 else 0
 
         # Count how many views use this object
-        view_usage = 0
-        for scene in self.app.scenes:
-            for view in scene.views:
-                if view.source and view.source.object == obj.key:
-                    view_usage += 1
+        view_usage = self._view_counts_by_object[obj.key]
 
-        max_views = sum(len(scene.views) for scene in self.app.scenes)
+        max_views = len(self._all_views)
         view_score = view_usage / max_views if max_views > 0 else 0
 
         # Weighted average (connections more important)
@@ -927,8 +994,9 @@ class KnackSleuth:
         # Build connection graph
         edges = []
         for obj in self.app.objects:
-            if obj.connections:
-                for conn in obj.connections.outbound:
+            conns = obj.connections
+            if conns is not None:
+                for conn in conns.outbound:
                     edges.append(
                         {
                             "from": obj.key,
@@ -998,10 +1066,11 @@ class KnackSleuth:
         adjacency = {obj.key: set() for obj in self.app.objects}
 
         for obj in self.app.objects:
-            if obj.connections:
-                for conn in obj.connections.outbound:
+            conns = obj.connections
+            if conns is not None:
+                for conn in conns.outbound:
                     adjacency[obj.key].add(conn.object)
-                for conn in obj.connections.inbound:
+                for conn in conns.inbound:
                     adjacency[obj.key].add(conn.object)
 
         # Simple clustering: find objects with shared neighbors
@@ -1139,9 +1208,9 @@ class KnackSleuth:
             else:
                 public_scenes += 1
 
-            for view in scene.views:
-                view_type = view.type
-                view_type_counts[view_type] = view_type_counts.get(view_type, 0) + 1
+        for view in self._all_views:
+            view_type = view.type
+            view_type_counts[view_type] = view_type_counts.get(view_type, 0) + 1
 
         # Calculate navigation depth
         max_depth = 0
@@ -1234,16 +1303,7 @@ class KnackSleuth:
                 len(obj.connections.inbound) == 0 and len(obj.connections.outbound) == 0
             ):
                 # Check if used in any views
-                used_in_views = False
-                for scene in self.app.scenes:
-                    for view in scene.views:
-                        if view.source and view.source.object == obj.key:
-                            used_in_views = True
-                            break
-                    if used_in_views:
-                        break
-
-                if not used_in_views:
+                if obj.key not in self._view_counts_by_object:
                     orphaned_objects_count += 1
                     orphaned_objects_list.append({"name": obj.name, "object_key": obj.key})
 
@@ -1290,8 +1350,9 @@ class KnackSleuth:
         # Identify tight coupling
         tight_coupling = []
         for obj in self.app.objects:
-            if obj.connections:
-                for conn in obj.connections.outbound:
+            conns = obj.connections
+            if conns is not None:
+                for conn in conns.outbound:
                     target = self.objects_by_key.get(conn.object)
                     if target:
                         # Check if they have many shared connections
@@ -1,21 +1,24 @@
 """Pytest configuration and shared fixtures."""
 
-import json
 from pathlib import Path
 import pytest
+from pydantic_core import from_json
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_metadata_file():
     """Path to sample Knack metadata JSON file."""
     return Path("tests/data/sample_knack_app_meta.json")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_metadata_dict(sample_metadata_file):
-    """Sample Knack metadata as a dictionary."""
-    with sample_metadata_file.open() as f:
-        return json.load(f)
+    """Sample Knack metadata as a dictionary.
+
+    Parsed once per session with pydantic-core's JSON parser. Shared by the
+    whole session - tests that modify it must deepcopy it first.
+    """
+    return from_json(sample_metadata_file.read_bytes())
 
 
 @pytest.fixture
@@ -1,11 +1,20 @@
 """High-value tests for knack_sleuth.core module."""
 
 import json
+import os
+import stat
 from pathlib import Path
 from datetime import datetime, timedelta
 import pytest
 
-from knack_sleuth.core import load_app_metadata
+from knack_sleuth.core import (
+    _http_client,
+    _list_cache_files,
+    find_valid_cache,
+    load_app_metadata,
+    read_metadata_file,
+    write_cache,
+)
 from knack_sleuth.models import KnackAppMetadata
 
 
@@ -36,16 +45,19 @@ class TestLoadFromFile:
         with pytest.raises(json.JSONDecodeError):
             load_app_metadata(file_path=invalid_file)
 
+    def test_read_metadata_file_matches_stdlib(self, sample_metadata_file):
+        """Test the fast JSON reader decodes exactly what the stdlib does."""
+        with sample_metadata_file.open() as f:
+            expected = json.load(f)
+        assert read_metadata_file(sample_metadata_file) == expected
+
 
 class TestNoCacheParameter:
     """Tests for the no_cache parameter functionality."""
     
     def test_no_cache_true_no_files_created(self, tmp_path, mocker, mock_api_response):
         """Verify no_cache=True doesn't create cache files."""
-        # Change to temp directory to avoid polluting project dir
-        mocker.patch("knack_sleuth.core.Path.cwd", return_value=tmp_path)
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[])
-        mock_get = mocker.patch("knack_sleuth.core.httpx.get", return_value=mock_api_response)
+        mock_get = mocker.patch.object(_http_client(), "get", return_value=mock_api_response)
         
         # Mock Settings to avoid needing environment variables
         mock_settings = mocker.MagicMock()
@@ -53,7 +65,7 @@ class TestNoCacheParameter:
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
         # Load with no_cache=True
-        metadata = load_app_metadata(app_id="test123", no_cache=True)
+        metadata = load_app_metadata(app_id="test123", no_cache=True, cache_dir=tmp_path)
         
         assert isinstance(metadata, KnackAppMetadata)
         assert metadata.application.name == "Sample Application"
@@ -67,67 +79,39 @@ class TestNoCacheParameter:
     
     def test_no_cache_false_creates_cache(self, tmp_path, mocker, mock_api_response):
         """Verify no_cache=False creates cache files."""
-        # Change to temp directory
-        original_cwd = Path.cwd()
-        mocker.patch("knack_sleuth.core.Path.cwd", return_value=tmp_path)
-        
-        # Mock glob to return empty list (no existing cache)
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[])
-        mock_get = mocker.patch("knack_sleuth.core.httpx.get", return_value=mock_api_response)
+        mock_get = mocker.patch.object(_http_client(), "get", return_value=mock_api_response)
         
         # Mock Settings
         mock_settings = mocker.MagicMock()
         mock_settings.knack_app_id = None
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
-        # Mock Path to write to tmp_path
-        original_path_init = Path.__init__
-        
-        def mock_path_init(self, *args, **kwargs):
-            # If it's a cache filename, redirect to tmp_path
-            if args and isinstance(args[0], str) and "_app_metadata_" in args[0]:
-                original_path_init(self, tmp_path / args[0])
-            else:
-                original_path_init(self, *args, **kwargs)
-        
-        mocker.patch.object(Path, "__init__", mock_path_init)
-        
-        # Load with no_cache=False (default)
-        metadata = load_app_metadata(app_id="test123", no_cache=False)
+        # Load with no_cache=False, caching into tmp_path (which starts empty)
+        metadata = load_app_metadata(app_id="test123", no_cache=False, cache_dir=tmp_path)
         
         assert isinstance(metadata, KnackAppMetadata)
+        mock_get.assert_called_once()
         
-        # Note: Due to mocking complexity, we verify the open() was called with 'w' mode
-        # In real usage, this creates the cache file
+        cache_files = list(tmp_path.glob("test123_app_metadata_*.json"))
+        assert len(cache_files) == 1, "Cache file should be created with no_cache=False"
+        assert json.loads(cache_files[0].read_text()) == mock_api_response.json()
     
     def test_no_cache_default_is_false(self, mocker, mock_api_response, tmp_path):
         """Verify default behavior allows caching."""
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[])
-        mock_get = mocker.patch("knack_sleuth.core.httpx.get", return_value=mock_api_response)
+        mock_get = mocker.patch.object(_http_client(), "get", return_value=mock_api_response)
         
         mock_settings = mocker.MagicMock()
         mock_settings.knack_app_id = None
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
-        # Track calls to Path.open for write operations
-        original_open = Path.open
-        open_calls = []
-        
-        def track_open(self, *args, **kwargs):
-            open_calls.append((args, kwargs))
-            # Return a mock file object for 'w' mode
-            if args and args[0] == 'w':
-                return mocker.mock_open()()
-            return original_open(self, *args, **kwargs)
-        
-        mocker.patch.object(Path, "open", track_open)
-        
         # Load without specifying no_cache (should default to False)
-        metadata = load_app_metadata(app_id="test123")
+        metadata = load_app_metadata(app_id="test123", cache_dir=tmp_path)
         
-        # Verify that open was called with 'w' mode (cache write attempt)
-        write_calls = [call for call in open_calls if call[0] and call[0][0] == 'w']
-        assert len(write_calls) > 0, "Should attempt to write cache file by default"
+        # Verify the cache file was written and no temporary file was left behind
+        cache_files = list(tmp_path.glob("test123_app_metadata_*.json"))
+        assert len(cache_files) == 1, "Should write cache file by default"
+        assert json.loads(cache_files[0].read_text()) == mock_api_response.json()
+        assert not list(tmp_path.glob("*.tmp"))
 
 
 class TestCacheExpiry:
@@ -145,18 +129,15 @@ class TestCacheExpiry:
         mocker.patch("knack_sleuth.core.datetime.now", return_value=datetime.now())
         mocker.patch("knack_sleuth.core.datetime.fromtimestamp", return_value=one_hour_ago)
         
-        # Mock glob to return our cache file
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[str(cache_file)])
-        
-        # Mock httpx.get - should NOT be called if cache is used
-        mock_get = mocker.patch("knack_sleuth.core.httpx.get")
+        # Mock the HTTP client - should NOT be called if cache is used
+        mock_get = mocker.patch.object(_http_client(), "get")
         
         mock_settings = mocker.MagicMock()
         mock_settings.knack_app_id = None
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
-        # Load metadata
-        metadata = load_app_metadata(app_id="test123", no_cache=False)
+        # Load metadata; cache discovery finds the file in tmp_path
+        metadata = load_app_metadata(app_id="test123", no_cache=False, cache_dir=tmp_path)
         
         assert isinstance(metadata, KnackAppMetadata)
         assert metadata.application.name == "Sample Application"
@@ -176,21 +157,15 @@ class TestCacheExpiry:
         mocker.patch("knack_sleuth.core.datetime.now", return_value=datetime.now())
         mocker.patch("knack_sleuth.core.datetime.fromtimestamp", return_value=twenty_five_hours_ago)
         
-        # Mock glob to return our expired cache file
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[str(cache_file)])
-        
-        # Mock httpx.get - SHOULD be called since cache is expired
-        mock_get = mocker.patch("knack_sleuth.core.httpx.get", return_value=mock_api_response)
+        # Mock the HTTP client - SHOULD be called since cache is expired
+        mock_get = mocker.patch.object(_http_client(), "get", return_value=mock_api_response)
         
         mock_settings = mocker.MagicMock()
         mock_settings.knack_app_id = None
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
-        # Mock file write to prevent actual cache creation
-        mocker.patch("builtins.open", mocker.mock_open())
-        
-        # Load metadata
-        metadata = load_app_metadata(app_id="test123", no_cache=False)
+        # Load metadata; the refreshed cache is written to tmp_path
+        metadata = load_app_metadata(app_id="test123", no_cache=False, cache_dir=tmp_path)
         
         assert isinstance(metadata, KnackAppMetadata)
         
@@ -198,6 +173,87 @@ class TestCacheExpiry:
         mock_get.assert_called_once()
 
 
+class TestCacheDiscovery:
+    """Tests for locating cache files."""
+
+    def test_lists_only_matching_cache_files(self, tmp_path, monkeypatch):
+        """Verify only this app's JSON cache files are listed."""
+        for name in [
+            "test123_app_metadata_202501011200.json",
+            "test123_app_metadata_202501021200.json",
+            "test123_app_metadata_202501031200.json.tmp",
+            "other_app_metadata_202501011200.json",
+            "test123_metadata.json",
+        ]:
+            (tmp_path / name).write_text("{}")
+        monkeypatch.chdir(tmp_path)
+
+        assert sorted(_list_cache_files("test123")) == [
+            "test123_app_metadata_202501011200.json",
+            "test123_app_metadata_202501021200.json",
+        ]
+
+    def test_find_valid_cache_in_cache_dir(self, tmp_path):
+        """Verify cache lookup honors an explicit cache directory."""
+        older = tmp_path / "test123_app_metadata_202501011200.json"
+        newer = tmp_path / "test123_app_metadata_202501021200.json"
+        older.write_text("{}")
+        newer.write_text("{}")
+
+        cache_path, age_hours = find_valid_cache("test123", cache_dir=tmp_path)
+
+        assert cache_path == newer
+        assert age_hours < 1
+
+    def test_missing_cache_dir_is_created(self, tmp_path, mocker, mock_api_response):
+        """Verify a cache directory that does not exist yet is treated as empty and created."""
+        cache_dir = tmp_path / "not" / "there"
+        mock_get = mocker.patch.object(_http_client(), "get", return_value=mock_api_response)
+
+        mock_settings = mocker.MagicMock()
+        mock_settings.knack_app_id = None
+        mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
+
+        assert find_valid_cache("test123", cache_dir=cache_dir) is None
+
+        metadata = load_app_metadata(app_id="test123", cache_dir=cache_dir)
+
+        assert isinstance(metadata, KnackAppMetadata)
+        mock_get.assert_called_once()
+        assert len(list(cache_dir.glob("test123_app_metadata_*.json"))) == 1
+
+
+class TestWriteCache:
+    """Tests for writing cache files."""
+
+    def test_write_cache_round_trips(self, tmp_path, sample_metadata_dict):
+        """Verify the cache file holds the metadata and no temporary file remains."""
+        cache_path = write_cache("test123", sample_metadata_dict, tmp_path)
+
+        assert cache_path.parent == tmp_path
+        assert read_metadata_file(cache_path) == sample_metadata_dict
+        assert list(tmp_path.iterdir()) == [cache_path]
+
+    def test_write_cache_uses_umask_permissions(self, tmp_path, sample_metadata_dict):
+        """Verify the cache file is readable by others, like a plain open() would create it."""
+        old_umask = os.umask(0o022)
+        try:
+            cache_path = write_cache("test123", sample_metadata_dict, tmp_path)
+        finally:
+            os.umask(old_umask)
+
+        assert stat.S_IMODE(cache_path.stat().st_mode) == 0o644
+
+    def test_failed_write_leaves_no_files(self, tmp_path, mocker, sample_metadata_dict):
+        """Verify a failed write cleans up its temporary file."""
+        mocker.patch("knack_sleuth.core.os.replace", side_effect=OSError("disk full"))
+
+        with pytest.raises(OSError, match="disk full"):
+            write_cache("test123", sample_metadata_dict, tmp_path)
+
+        assert list(tmp_path.iterdir()) == []
+
+
 class TestRefreshParameter:
     """Tests for the refresh parameter."""
     
@@ -207,25 +263,23 @@ class TestRefreshParameter:
         cache_file = tmp_path / "test123_app_metadata_202501011200.json"
         cache_file.write_text(json.dumps(sample_metadata_dict))
         
-        # Mock glob to return cache file, but refresh should ignore it
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[str(cache_file)])
-        
-        # Mock httpx.get - SHOULD be called even though cache is valid
-        mock_get = mocker.patch("knack_sleuth.core.httpx.get", return_value=mock_api_response)
+        # Mock the HTTP client - SHOULD be called even though cache is valid
+        mock_get = mocker.patch.object(_http_client(), "get", return_value=mock_api_response)
         
         mock_settings = mocker.MagicMock()
         mock_settings.knack_app_id = None
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
-        mocker.patch("builtins.open", mocker.mock_open())
-        
-        # Load with refresh=True
-        metadata = load_app_metadata(app_id="test123", refresh=True)
+        # Load with refresh=True; the refreshed cache is written to tmp_path
+        metadata = load_app_metadata(app_id="test123", refresh=True, cache_dir=tmp_path)
         
         assert isinstance(metadata, KnackAppMetadata)
         
         # Verify API WAS called (cache ignored due to refresh)
         mock_get.assert_called_once()
+        
+        # Verify a fresh cache file was written next to the old one
+        assert len(list(tmp_path.glob("test123_app_metadata_*.json"))) == 2
 
 
 class TestErrorHandling:
@@ -248,8 +302,8 @@ class TestErrorHandling:
         mock_settings.knack_app_id = None
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[])
-        mocker.patch("knack_sleuth.core.httpx.get", side_effect=mock_api_error)
+        mocker.patch("knack_sleuth.core._list_cache_files", return_value=[])
+        mocker.patch.object(_http_client(), "get", side_effect=mock_api_error)
         
         with pytest.raises(httpx.HTTPStatusError):
             load_app_metadata(app_id="invalid123", no_cache=True)
@@ -262,9 +316,10 @@ class TestErrorHandling:
         mock_settings.knack_app_id = None
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[])
-        mocker.patch(
-            "knack_sleuth.core.httpx.get",
+        mocker.patch("knack_sleuth.core._list_cache_files", return_value=[])
+        mocker.patch.object(
+            _http_client(),
+            "get",
             side_effect=httpx.RequestError("Network error")
         )
         
@@ -282,10 +337,8 @@ class TestSettingsIntegration:
         mock_settings.knack_app_id = "env_app_123"
         mocker.patch("knack_sleuth.core.Settings", return_value=mock_settings)
         
-        mocker.patch("knack_sleuth.core.glob.glob", return_value=[])
-        mock_get = mocker.patch("knack_sleuth.core.httpx.get", return_value=mock_api_response)
-        mocker.patch("builtins.open", mocker.mock_open())
-        
+        mocker.patch("knack_sleuth.core._list_cache_files", return_value=[])
+        mock_get = mocker.patch.object(_http_client(), "get", return_value=mock_api_response)
         # Load without providing app_id
         metadata = load_app_metadata(no_cache=True)
         
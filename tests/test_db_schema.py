@@ -1,30 +1,74 @@
 """Tests for database schema export functionality."""
 
 
+import io
+import json
+import stat
+
 import pytest
 import yaml
 
+try:
+    # libyaml-backed parser when PyYAML was built with it
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:  # pragma: no cover - depends on the PyYAML build
+    from yaml import SafeLoader as _YamlLoader
+
 from knack_sleuth.db_schema import (
     export_database_schema,
     export_to_dbml,
+    export_to_dbml_stream,
     export_to_json_schema,
+    export_to_mermaid,
+    export_to_mermaid_stream,
     export_to_yaml,
+    write_database_schema,
 )
 from knack_sleuth.models import KnackAppMetadata
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_app(sample_metadata_dict):
-    """Sample Knack application."""
+    """Sample Knack application, validated once and shared read-only."""
     return KnackAppMetadata(**sample_metadata_dict).application
 
 
+@pytest.fixture(scope="session")
+def sample_json_schema(sample_app):
+    """JSON Schema export of the sample app at the default (standard) detail."""
+    return export_to_json_schema(sample_app)
+
+
+@pytest.fixture(scope="session")
+def sample_json_schema_minimal(sample_app):
+    """JSON Schema export of the sample app at minimal detail."""
+    return export_to_json_schema(sample_app, detail="minimal")
+
+
+@pytest.fixture(scope="session")
+def sample_json_schema_compact(sample_app):
+    """JSON Schema export of the sample app at compact detail."""
+    return export_to_json_schema(sample_app, detail="compact")
+
+
+@pytest.fixture(scope="session")
+def sample_dbml(sample_app):
+    """DBML export of the sample app at the default (standard) detail."""
+    return export_to_dbml(sample_app)
+
+
+@pytest.fixture(scope="session")
+def sample_yaml(sample_app):
+    """YAML export of the sample app at the default (standard) detail."""
+    return export_to_yaml(sample_app)
+
+
 class TestJSONSchemaExport:
     """Tests for JSON Schema export."""
 
-    def test_export_to_json_schema(self, sample_app):
+    def test_export_to_json_schema(self, sample_app, sample_json_schema):
         """Test exporting to JSON Schema format."""
-        schema = export_to_json_schema(sample_app)
+        schema = sample_json_schema
 
         # Check schema structure
         assert schema["$schema"] == "http://json-schema.org/draft-07/schema#"
@@ -46,9 +90,9 @@ class TestJSONSchemaExport:
             assert obj_schema["x-knack-key"] == obj.key
             assert "properties" in obj_schema
 
-    def test_json_schema_field_properties(self, sample_app):
+    def test_json_schema_field_properties(self, sample_app, sample_json_schema):
         """Test that fields are properly represented in JSON Schema."""
-        schema = export_to_json_schema(sample_app)
+        schema = sample_json_schema
 
         # Find first object with fields
         obj = sample_app.objects[0]
@@ -63,9 +107,9 @@ class TestJSONSchemaExport:
             assert field_schema["x-knack-type"] == field.type
             assert field_schema["x-knack-key"] == field.key
 
-    def test_json_schema_required_fields(self, sample_app):
+    def test_json_schema_required_fields(self, sample_app, sample_json_schema):
         """Test that required fields are marked in schema."""
-        schema = export_to_json_schema(sample_app)
+        schema = sample_json_schema
 
         for obj in sample_app.objects:
             obj_schema = schema["definitions"][obj.key]
@@ -75,9 +119,9 @@ class TestJSONSchemaExport:
                 assert "required" in obj_schema
                 assert obj_schema["required"] == required_fields
 
-    def test_json_schema_connections(self, sample_app):
+    def test_json_schema_connections(self, sample_app, sample_json_schema):
         """Test that connections are properly represented."""
-        schema = export_to_json_schema(sample_app)
+        schema = sample_json_schema
 
         for obj in sample_app.objects:
             if obj.connections and obj.connections.outbound:
@@ -94,9 +138,9 @@ class TestJSONSchemaExport:
                     assert conn_schema["has"] in ["one", "many"]
                     assert conn_schema["belongs_to"] in ["one", "many"]
 
-    def test_json_schema_relationship_fields(self, sample_app):
+    def test_json_schema_relationship_fields(self, sample_app, sample_json_schema):
         """Test that relationship fields have proper metadata."""
-        schema = export_to_json_schema(sample_app)
+        schema = sample_json_schema
 
         for obj in sample_app.objects:
             obj_schema = schema["definitions"][obj.key]
@@ -109,13 +153,24 @@ class TestJSONSchemaExport:
                     assert rel["object"] == field.relationship.object
                     assert rel["belongs_to"] == field.relationship.belongs_to
 
+    def test_json_schema_results_are_independent(self, sample_app):
+        """Test that changing one export's dicts does not leak into later exports."""
+        first = export_to_json_schema(sample_app)
+        for obj_schema in first["definitions"].values():
+            for field_schema in obj_schema["properties"].values():
+                field_schema.get("x-format", {}).clear()
+                field_schema.get("x-relationship", {}).clear()
+
+        assert export_to_json_schema(sample_app) == export_to_json_schema(sample_app)
+        assert export_to_json_schema(sample_app) != first
+
 
 class TestDBMLExport:
     """Tests for DBML export."""
 
-    def test_export_to_dbml(self, sample_app):
+    def test_export_to_dbml(self, sample_app, sample_dbml):
         """Test exporting to DBML format."""
-        dbml = export_to_dbml(sample_app)
+        dbml = sample_dbml
 
         assert isinstance(dbml, str)
         assert len(dbml) > 0
@@ -125,18 +180,18 @@ class TestDBMLExport:
         assert f"Knack App ID: {sample_app.id}" in dbml
         assert "Project knack_app" in dbml
 
-    def test_dbml_contains_tables(self, sample_app):
+    def test_dbml_contains_tables(self, sample_app, sample_dbml):
         """Test that DBML contains table definitions."""
-        dbml = export_to_dbml(sample_app)
+        dbml = sample_dbml
 
         # All objects should be represented as tables
         for obj in sample_app.objects:
             assert f"Table {obj.key}" in dbml
             assert f"// {obj.name}" in dbml
 
-    def test_dbml_contains_fields(self, sample_app):
+    def test_dbml_contains_fields(self, sample_app, sample_dbml):
         """Test that DBML contains field definitions."""
-        dbml = export_to_dbml(sample_app)
+        dbml = sample_dbml
 
         # Check that fields are included
         for obj in sample_app.objects:
@@ -144,9 +199,9 @@ class TestDBMLExport:
                 # Field key should be in the DBML
                 assert field.key in dbml
 
-    def test_dbml_contains_relationships(self, sample_app):
+    def test_dbml_contains_relationships(self, sample_app, sample_dbml):
         """Test that DBML contains relationship definitions."""
-        dbml = export_to_dbml(sample_app)
+        dbml = sample_dbml
 
         # Check for relationships section
         assert "// Relationships" in dbml
@@ -158,9 +213,9 @@ class TestDBMLExport:
                     # Should have a Ref line for each connection
                     assert f"Ref: {obj.key}.{conn.key}" in dbml
 
-    def test_dbml_field_constraints(self, sample_app):
+    def test_dbml_field_constraints(self, sample_app, sample_dbml):
         """Test that DBML includes field constraints."""
-        dbml = export_to_dbml(sample_app)
+        dbml = sample_dbml
 
         # Look for required and unique constraints
         for obj in sample_app.objects:
@@ -172,35 +227,109 @@ class TestDBMLExport:
                     assert "not null" in dbml
 
 
+class TestStreamingExport:
+    """Tests for the streaming DBML/Mermaid writers."""
+
+    @pytest.mark.parametrize(
+        "export, export_stream",
+        [
+            (export_to_dbml, export_to_dbml_stream),
+            (export_to_mermaid, export_to_mermaid_stream),
+        ],
+    )
+    def test_stream_matches_string_export(self, sample_app, export, export_stream):
+        """Test that streaming to a file-like object writes identical text."""
+        buf = io.StringIO()
+        export_stream(sample_app, buf, detail="compact")
+        assert buf.getvalue() == export(sample_app, detail="compact")
+
+
+class TestWriteDatabaseSchema:
+    """Tests for saving a schema export to a file."""
+
+    @pytest.mark.parametrize(
+        "fmt, read_back",
+        [
+            ("json", json.loads),
+            ("dbml", str),
+            ("yaml", str),
+            ("mermaid", str),
+        ],
+    )
+    def test_file_matches_export(self, tmp_path, sample_app, fmt, read_back):
+        """Test that the saved file holds exactly the exported schema."""
+        path = tmp_path / f"schema.{fmt}"
+        write_database_schema(sample_app, path, format=fmt, detail="compact")
+
+        expected = export_database_schema(sample_app, format=fmt, detail="compact")
+        assert read_back(path.read_text()) == expected
+
+    @pytest.mark.parametrize("fmt", ["json", "dbml", "yaml", "mermaid"])
+    def test_failed_export_leaves_no_file(self, tmp_path, sample_app, fmt):
+        """Test that an unsupported detail level fails without creating the file."""
+        path = tmp_path / f"schema.{fmt}"
+
+        with pytest.raises(ValueError, match="Unsupported detail level"):
+            write_database_schema(sample_app, path, format=fmt, detail="invalid")
+
+        assert not path.exists()
+
+    def test_failed_stream_keeps_existing_file(self, tmp_path, sample_app, mocker):
+        """Test that a streaming export failing midway leaves the old file untouched."""
+        path = tmp_path / "schema.dbml"
+        path.write_text("previous export")
+        mocker.patch(
+            "knack_sleuth.db_schema._dbml_lines",
+            return_value=iter(["Project knack_app {", 1]),
+        )
+
+        with pytest.raises(TypeError):
+            write_database_schema(sample_app, path, format="dbml")
+
+        assert path.read_text() == "previous export"
+        assert list(tmp_path.iterdir()) == [path]
+
+    def test_stream_replaces_existing_file(self, tmp_path, sample_app):
+        """Test that a successful streaming export replaces the old file."""
+        path = tmp_path / "schema.mmd"
+        path.write_text("previous export")
+
+        write_database_schema(sample_app, path, format="mermaid")
+
+        assert path.read_text() == export_database_schema(sample_app, format="mermaid")
+        assert stat.S_IMODE(path.stat().st_mode) & 0o644 == 0o644
+        assert list(tmp_path.iterdir()) == [path]
+
+
 class TestYAMLExport:
     """Tests for YAML export."""
 
-    def test_export_to_yaml(self, sample_app):
+    def test_export_to_yaml(self, sample_yaml):
         """Test exporting to YAML format."""
-        yaml_str = export_to_yaml(sample_app)
+        yaml_str = sample_yaml
 
         assert isinstance(yaml_str, str)
         assert len(yaml_str) > 0
 
         # Parse YAML to verify structure
-        data = yaml.safe_load(yaml_str)
+        data = yaml.load(yaml_str, Loader=_YamlLoader)
         assert "application" in data
         assert "objects" in data
 
-    def test_yaml_application_metadata(self, sample_app):
+    def test_yaml_application_metadata(self, sample_app, sample_yaml):
         """Test that YAML contains application metadata."""
-        yaml_str = export_to_yaml(sample_app)
-        data = yaml.safe_load(yaml_str)
+        yaml_str = sample_yaml
+        data = yaml.load(yaml_str, Loader=_YamlLoader)
 
         app_data = data["application"]
         assert app_data["name"] == sample_app.name
         assert app_data["slug"] == sample_app.slug
         assert app_data["id"] == sample_app.id
 
-    def test_yaml_objects_structure(self, sample_app):
+    def test_yaml_objects_structure(self, sample_app, sample_yaml):
         """Test that YAML contains proper object structure."""
-        yaml_str = export_to_yaml(sample_app)
-        data = yaml.safe_load(yaml_str)
+        yaml_str = sample_yaml
+        data = yaml.load(yaml_str, Loader=_YamlLoader)
 
         # Verify all objects are present
         assert len(data["objects"]) == len(sample_app.objects)
@@ -211,10 +340,10 @@ class TestYAMLExport:
             assert "fields" in obj_data
             assert isinstance(obj_data["fields"], list)
 
-    def test_yaml_fields_structure(self, sample_app):
+    def test_yaml_fields_structure(self, sample_app, sample_yaml):
         """Test that YAML contains proper field structure."""
-        yaml_str = export_to_yaml(sample_app)
-        data = yaml.safe_load(yaml_str)
+        yaml_str = sample_yaml
+        data = yaml.load(yaml_str, Loader=_YamlLoader)
 
         for obj_data, obj in zip(data["objects"], sample_app.objects):
             # Verify fields
@@ -228,10 +357,10 @@ class TestYAMLExport:
                 assert field_data["required"] == field.required
                 assert field_data["unique"] == field.unique
 
-    def test_yaml_connections(self, sample_app):
+    def test_yaml_connections(self, sample_app, sample_yaml):
         """Test that YAML includes connection information."""
-        yaml_str = export_to_yaml(sample_app)
-        data = yaml.safe_load(yaml_str)
+        yaml_str = sample_yaml
+        data = yaml.load(yaml_str, Loader=_YamlLoader)
 
         for obj_data, obj in zip(data["objects"], sample_app.objects):
             if obj.connections and (obj.connections.outbound or obj.connections.inbound):
@@ -247,10 +376,10 @@ class TestYAMLExport:
                         assert conn_data["target_object"] == conn.object
                         assert "relationship_type" in conn_data
 
-    def test_yaml_relationship_types(self, sample_app):
+    def test_yaml_relationship_types(self, sample_yaml):
         """Test that relationship types are correctly identified."""
-        yaml_str = export_to_yaml(sample_app)
-        data = yaml.safe_load(yaml_str)
+        yaml_str = sample_yaml
+        data = yaml.load(yaml_str, Loader=_YamlLoader)
 
         valid_relationship_types = {
             "one-to-one",
@@ -272,24 +401,19 @@ class TestYAMLExport:
 class TestExportDatabaseSchema:
     """Tests for the main export_database_schema function."""
 
-    def test_export_json_format(self, sample_app):
-        """Test exporting with JSON format."""
-        result = export_database_schema(sample_app, format="json")
-        assert isinstance(result, dict)
-        assert "$schema" in result
-
-    def test_export_dbml_format(self, sample_app):
-        """Test exporting with DBML format."""
-        result = export_database_schema(sample_app, format="dbml")
-        assert isinstance(result, str)
-        assert "Table" in result
-
-    def test_export_yaml_format(self, sample_app):
-        """Test exporting with YAML format."""
-        result = export_database_schema(sample_app, format="yaml")
-        assert isinstance(result, str)
-        data = yaml.safe_load(result)
-        assert "application" in data
+    @pytest.mark.parametrize(
+        "fmt, expected_type, expected_fixture",
+        [
+            ("json", dict, "sample_json_schema"),
+            ("dbml", str, "sample_dbml"),
+            ("yaml", str, "sample_yaml"),
+        ],
+    )
+    def test_export_format(self, request, sample_app, fmt, expected_type, expected_fixture):
+        """Test that each format dispatches to its exporter."""
+        result = export_database_schema(sample_app, format=fmt)
+        assert isinstance(result, expected_type)
+        assert result == request.getfixturevalue(expected_fixture)
 
     def test_export_invalid_format(self, sample_app):
         """Test that invalid format raises ValueError."""
@@ -305,62 +429,43 @@ class TestExportDatabaseSchema:
 class TestDetailLevels:
     """Tests for detail level filtering."""
 
-    def test_minimal_detail_json(self, sample_app):
-        """Test minimal detail includes only connection fields."""
-        schema = export_to_json_schema(sample_app, detail="minimal")
+    def test_structural_detail_json(self, sample_app):
+        """Test structural detail includes no fields."""
+        schema = export_to_json_schema(sample_app, detail="structural")
 
-        # Find an object with both connection and non-connection fields
         for obj in sample_app.objects:
-            if not obj.fields:
-                continue
-
             obj_schema = schema["definitions"][obj.key]
-            fields_in_schema = obj_schema["properties"]
-
-            # Check that only connection fields are included
-            for field in obj.fields:
-                if field.type == "connection":
-                    assert field.key in fields_in_schema, f"Connection field {field.key} should be in minimal detail"
-                else:
-                    assert field.key not in fields_in_schema, f"Non-connection field {field.key} should not be in minimal detail"
-
-    def test_compact_detail_json(self, sample_app):
-        """Test compact detail includes identifier, required, and connection fields."""
-        schema = export_to_json_schema(sample_app, detail="compact")
-
-        # Find an object with various field types
-        for obj in sample_app.objects:
-            if not obj.fields:
-                continue
-
-            obj_schema = schema["definitions"][obj.key]
-            fields_in_schema = obj_schema["properties"]
-
-            # Check field inclusion rules
-            for field in obj.fields:
-                should_include = (
-                    field.type == "connection" or
-                    field.key == obj.identifier or
-                    field.required
-                )
+            assert obj_schema["properties"] == {}
+            assert "required" not in obj_schema
+
+    @pytest.mark.parametrize(
+        "schema_fixture, should_include",
+        [
+            # minimal: only connection fields
+            (
+                "sample_json_schema_minimal",
+                lambda field, obj: field.type == "connection",
+            ),
+            # compact: identifier, required, and connection fields
+            (
+                "sample_json_schema_compact",
+                lambda field, obj: (
+                    field.type == "connection" or field.key == obj.identifier or field.required
+                ),
+            ),
+            # standard: all fields
+            ("sample_json_schema", lambda field, obj: True),
+        ],
+        ids=["minimal", "compact", "standard"],
+    )
+    def test_detail_json_fields(self, request, sample_app, schema_fixture, should_include):
+        """Test that each detail level includes exactly the expected fields."""
+        schema = request.getfixturevalue(schema_fixture)
 
-                if should_include:
-                    assert field.key in fields_in_schema, f"Field {field.key} should be in compact detail"
-                else:
-                    assert field.key not in fields_in_schema, f"Field {field.key} should not be in compact detail"
-
-    def test_standard_detail_json(self, sample_app):
-        """Test standard detail includes all fields."""
-        schema = export_to_json_schema(sample_app, detail="standard")
-
-        # Verify all fields are included for all objects
         for obj in sample_app.objects:
-            obj_schema = schema["definitions"][obj.key]
-            fields_in_schema = obj_schema["properties"]
-
-            # All fields should be present
-            for field in obj.fields:
-                assert field.key in fields_in_schema, f"All fields should be in standard detail, missing {field.key}"
+            prop_keys = schema["definitions"][obj.key]["properties"].keys()
+            expected_keys = {f.key for f in obj.fields if should_include(f, obj)}
+            assert prop_keys == expected_keys, f"Wrong fields exported for {obj.key}"
 
     def test_minimal_detail_dbml(self, sample_app):
         """Test minimal detail DBML includes only connection fields."""
@@ -376,19 +481,20 @@ class TestDetailLevels:
     def test_compact_detail_yaml(self, sample_app):
         """Test compact detail YAML structure."""
         yaml_str = export_to_yaml(sample_app, detail="compact")
-        data = yaml.safe_load(yaml_str)
+        data = yaml.load(yaml_str, Loader=_YamlLoader)
 
         # Verify basic structure
         assert "application" in data
         assert "objects" in data
 
         # Check that fields are filtered
+        objects_by_key = {o.key: o for o in sample_app.objects}
         for obj_data in data["objects"]:
             if not obj_data["fields"]:
                 continue
 
             # Find corresponding object in sample_app
-            obj = next(o for o in sample_app.objects if o.key == obj_data["key"])
+            obj = objects_by_key[obj_data["key"]]
 
             # Verify only appropriate fields are included
             field_keys_in_export = {f["key"] for f in obj_data["fields"]}
@@ -405,11 +511,19 @@ class TestDetailLevels:
                 else:
                     assert field.key not in field_keys_in_export
 
-    def test_detail_levels_preserve_connections(self, sample_app):
+    def test_detail_levels_preserve_connections(
+        self,
+        sample_app,
+        sample_json_schema_minimal,
+        sample_json_schema_compact,
+        sample_json_schema,
+    ):
         """Test that all detail levels preserve connection metadata."""
-        for detail in ["minimal", "compact", "standard"]:
-            schema = export_to_json_schema(sample_app, detail=detail)
-
+        for detail, schema in [
+            ("minimal", sample_json_schema_minimal),
+            ("compact", sample_json_schema_compact),
+            ("standard", sample_json_schema),
+        ]:
             # Verify connections are preserved for all objects
             for obj in sample_app.objects:
                 if obj.connections:
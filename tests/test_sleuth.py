@@ -0,0 +1,130 @@
+"""Tests for object and field usage search."""
+
+import copy
+import dataclasses
+
+import pytest
+
+from knack_sleuth.models import KnackAppMetadata
+from knack_sleuth.sleuth import KnackSleuth
+
+
+@pytest.fixture(scope="session")
+def sleuth(sample_metadata_dict):
+    """Search engine over the sample Knack application, shared read-only."""
+    return KnackSleuth(KnackAppMetadata(**sample_metadata_dict))
+
+
+class TestSearchObject:
+    """Tests for object search."""
+
+    def test_unknown_object(self, sleuth):
+        """Test searching for an object that does not exist."""
+        assert sleuth.search_object("object_9999") == {}
+
+    def test_object_usages(self, sleuth):
+        """Test connection and view usages of an object."""
+        results = sleuth.search_object("object_13")
+        location_types = [u.location_type for u in results["object_usages"]]
+
+        assert location_types[:4] == [
+            "connection_inbound",
+            "connection_inbound",
+            "connection_outbound",
+            "connection_outbound",
+        ]
+        assert "view_source" in location_types
+
+    def test_field_cascade(self, sleuth):
+        """Test that only fields of the object with usages are included."""
+        results = sleuth.search_object("object_2")
+        field_keys = {f.key for f in sleuth.get_object_info("object_2").fields}
+
+        cascaded = set(results) - {"object_usages"}
+        assert cascaded
+        assert cascaded <= field_keys
+        assert all(results[key] for key in cascaded)
+
+    def test_object_without_usages(self, sample_metadata_dict):
+        """Test an object whose fields are not referenced anywhere."""
+        metadata = copy.deepcopy(sample_metadata_dict)
+        metadata["application"]["objects"].append(
+            {
+                "key": "object_999",
+                "name": "Unused",
+                "fields": [{"key": "field_9999", "name": "Notes", "type": "paragraph_text"}],
+            }
+        )
+        sleuth = KnackSleuth(KnackAppMetadata(**metadata))
+
+        assert sleuth.search_object("object_999") == {"object_usages": []}
+
+    def test_repeat_search_not_affected_by_details_changes(self, sleuth):
+        """Test that usage details cannot be changed through a search result."""
+        first = sleuth.search_object("object_13")
+        expected = copy.deepcopy(first)
+
+        for usages in first.values():
+            for usage in usages:
+                with pytest.raises(TypeError):
+                    usage.details["scene_key"] = "changed"
+
+        assert sleuth.search_object("object_13") == expected
+
+    def test_repeat_search_not_affected_by_caller_changes(self, sleuth):
+        """Test that modifying returned results does not leak into later searches."""
+        first = sleuth.search_object("object_2")
+        expected = {key: list(usages) for key, usages in first.items()}
+
+        first["object_usages"].clear()
+        first.pop(next(k for k in first if k != "object_usages"))
+
+        assert sleuth.search_object("object_2") == expected
+
+
+class TestSearchField:
+    """Tests for field search."""
+
+    def test_unknown_field(self, sleuth):
+        """Test searching for a field that does not exist."""
+        assert sleuth.search_field("field_9999") == []
+
+    def test_field_usages_in_order(self, sleuth):
+        """Test that usages are grouped by location type in search order."""
+        usages = sleuth.search_field("field_4")
+
+        assert [u.location_type for u in usages[:4]] == [
+            "object_identifier",
+            "field_equation",
+            "view_column",
+            "view_sort",
+        ]
+
+    def test_equation_reference(self, sleuth):
+        """Test that a field referenced in an equation is found."""
+        usages = sleuth.search_field("field_4")
+        equations = [u for u in usages if u.location_type == "field_equation"]
+
+        assert len(equations) == 1
+        assert equations[0].details["field_key"] == "field_129"
+        assert equations[0].details["equation"] == "getNameLast({field_4})"
+
+    def test_connected_field_reference_not_matched(self, sleuth):
+        """Test that {field_107.field_89} does not count as a use of field_107."""
+        usages = sleuth.search_field("field_107")
+
+        assert not any(u.location_type == "field_equation" for u in usages)
+
+    def test_iter_field_usages(self, sleuth):
+        """Test that the lazy iterator yields the same usages as search_field."""
+        expected = sleuth.search_field("field_4")
+
+        assert next(sleuth.iter_field_usages("field_4")) is expected[0]
+        assert list(sleuth.iter_field_usages("field_4")) == expected
+
+    def test_usages_are_immutable(self, sleuth):
+        """Test that shared usages cannot be modified by callers."""
+        usage = sleuth.search_field("field_4")[0]
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            usage.context = "changed"